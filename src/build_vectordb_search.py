@@ -68,6 +68,7 @@ def build_vectordb_search(
         document_class=DynamicDocument,
         config_path=config_path,
         model_name=model_name,
+        embeddings=embeddings,
     )
 
 
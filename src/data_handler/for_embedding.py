@@ -2,12 +2,17 @@
 import os
 import json
 from datetime import datetime
-from typing import List, Dict, Any, Type
+from typing import List, Dict, Any, Optional, Type
 from dataclasses import fields
 
+import numpy as np
+
 # Assuming save_documents_batch is in this utility file
 from utils.save_as_csv_with_metadata import save_documents_batch
 
+# Same sidecar name as retrieval_system.data_loader.EMBEDDINGS_CACHE_SUFFIX
+EMBEDDINGS_SIDECAR_SUFFIX = ".f32.npy"
+
 
 def prepare_documents(
     documents_data: List[Dict], embeddings: Any, document_class: Type
@@ -58,6 +63,7 @@ def save_results(
     document_class: Type,
     config_path: str,
     model_name: str,
+    embeddings: Optional[np.ndarray] = None,
 ):
     """
     Saves the prepared documents to a CSV file and updates the configuration.
@@ -69,6 +75,10 @@ def save_results(
         document_class (Type): The dynamic dataclass used.
         config_path (str): The path to the configuration file for updating.
         model_name (str): The name of the model used for embeddings.
+        embeddings (Optional[np.ndarray]): If given, the embeddings of the saved
+            rows are also written L2-normalized as a `<csv>.f32.npy` sidecar (the
+            same cache file retrieval_system.data_loader uses) so loaders can
+            memory-map it instead of parsing the stringified `embedding` column.
     """
     # 1. Create save path and filename
     timestamp = datetime.now().strftime("%y%m%d_%H%M%S")
@@ -90,6 +100,22 @@ def save_results(
     print(
         f"--- SIMULATING SAVE to {output_file} ---"
     )  # Placeholder for your save function
+    if embeddings is not None:
+        # prepare_documents skips rows it cannot build, so the sidecar must come
+        # from the saved rows to stay aligned with the CSV
+        if len(documents_to_save) == len(embeddings):
+            saved = np.asarray(embeddings, dtype=np.float32)
+        elif all(hasattr(doc, "embedding") for doc in documents_to_save):
+            saved = np.asarray(
+                [doc.embedding for doc in documents_to_save], dtype=np.float32
+            )
+        else:
+            saved = None
+        if saved is not None:
+            saved = saved / (np.linalg.norm(saved, axis=1, keepdims=True) + 1e-12)
+            sidecar_file = output_file + EMBEDDINGS_SIDECAR_SUFFIX
+            np.save(sidecar_file, np.ascontiguousarray(saved, dtype=np.float32))
+            print(f"✅ Embedding sidecar saved to {sidecar_file}")
 
     # 3. Print results and update config
     print(f"✅ VectorDB saved to {output_file}")
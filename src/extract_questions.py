@@ -18,7 +18,7 @@ from __future__ import annotations
 import argparse
 import json
 import os
-from typing import Optional
+from typing import List, Optional
 
 try:
     import pandas as pd
@@ -79,14 +79,14 @@ def _pick_question_col(df, user_col: Optional[str]) -> str:
     )
 
 
-def main():
+def main(argv: Optional[List[str]] = None):
     ap = argparse.ArgumentParser(description="질문 컬럼을 JSONL로 추출")
     ap.add_argument("--input", required=True, help="입력 파일 경로")
     ap.add_argument("--output", required=True, help="출력 JSONL 경로")
     ap.add_argument(
         "--question-col", default=None, help="질문 컬럼명 (없으면 자동 탐지)"
     )
-    args = ap.parse_args()
+    args = ap.parse_args(argv)
 
     df = _load_df(args.input)
     # 컬럼명 BOM/공백 정리
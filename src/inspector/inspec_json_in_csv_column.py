@@ -55,6 +55,10 @@ _array_pat = re.compile(
     r"array\(\s*(\[[\s\S]*?\])\s*(?:,\s*dtype\s*=\s*[^)]*)?\)", re.MULTILINE
 )
 
+# python True/False/None 리터럴을 한 번의 치환으로 처리
+_PY_TO_JSON_LITERALS = {"True": "true", "False": "false", "None": "null"}
+_py_literal_pat = re.compile(r"\b(?:True|False|None)\b")
+
 
 def normalize_jsonish(s: str) -> str:
     if not isinstance(s, str):
@@ -71,9 +75,7 @@ def normalize_jsonish(s: str) -> str:
     txt = txt.replace("'", '"')  # 단일따옴표 -> 쌍따옴표
 
     # python True/False/None -> JSON true/false/null
-    txt = re.sub(r"\bTrue\b", "true", txt)
-    txt = re.sub(r"\bFalse\b", "false", txt)
-    txt = re.sub(r"\bNone\b", "null", txt)
+    txt = _py_literal_pat.sub(lambda m: _PY_TO_JSON_LITERALS[m.group(0)], txt)
 
     return txt
 
@@ -140,7 +142,8 @@ def process_csv_for_json_trees(
         return
 
     try:
-        df = pd.read_csv(csv_path, low_memory=False)
+        # 앞쪽 scan_rows 행만 검사하므로 그만큼만 파싱
+        df = pd.read_csv(csv_path, nrows=scan_rows, low_memory=False)
     except Exception as e:
         print(f"[WARN] skip {csv_path}: read error ({e})")
         return
@@ -151,8 +154,10 @@ def process_csv_for_json_trees(
 
     hits = 0
     for col in cols:
+        # 행 단위 Series 생성 없이 컬럼 값 배열을 바로 순회
+        values = df[col].to_numpy()
         for idx in range(min(scan_rows, len(df))):
-            cell = df.iloc[idx][col]
+            cell = values[idx]
             parsed = try_parse_jsonish(cell)
             if parsed is not None:
                 if hits == 0:
@@ -13,6 +13,9 @@ from functools import partial
 # --- Helper Functions (Unchanged) ---
 
 
+_JSON_FENCE_RE = re.compile(r"```(?:json)?\n(.*?)\n```", re.DOTALL | re.IGNORECASE)
+
+
 def _extract_json(text: str) -> Any:
     """Extract a JSON object/array from a model response.
 
@@ -20,8 +23,15 @@ def _extract_json(text: str) -> Any:
     """
     if text is None:
         raise ValueError("Empty response from model.")
+    # Common case: the whole response is bare JSON -> one parse, no regex/slicing
+    stripped = text.strip()
+    if stripped[:1] in ("{", "[") and stripped[-1:] in ("}", "]"):
+        try:
+            return json.loads(stripped)
+        except json.JSONDecodeError:
+            pass
     # Try code fences first
-    fence = re.search(r"```(?:json)?\n(.*?)\n```", text, re.DOTALL | re.IGNORECASE)
+    fence = _JSON_FENCE_RE.search(text)
     candidate = fence.group(1) if fence else text
     # Trim leading/trailing non-json
     start = candidate.find("{")
@@ -31,6 +31,7 @@ Notes
 -----
 - If your dataset lacks context, the model will rely on world knowledge. You can pass retrieved passages in `context` to improve faithfulness.
 - To throttle requests: use --qps 1.5 (max queries per second).
+- To overlap requests: use --workers 4 (sequential by default); --qps still caps the total rate.
 - To ensure deterministic output: set --temperature 0.0 and --seed.
 """
 
@@ -48,9 +49,11 @@ Multi-hop 질문을 Single-hop으로 변환하는 프로세스 실행 스크립
 - 최종 결과를 파일에 저장하거나 콘솔에 출력
 """
 import argparse
+import concurrent.futures
 import json
+import threading
 import time
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 
 # --- 핵심 로직 임포트 ---
 # llm_processor.py 파일이 같은 디렉토리나 PYTHONPATH에 있다고 가정합니다.
@@ -62,26 +65,41 @@ from llm_client.prompts_tools import read_jsonl
 from utils.write_jsonl import write_jsonl
 
 
+class _RateLimiter:
+    """여러 스레드가 공유하는 요청 간격 제한기 (초당 최대 qps회)."""
+
+    def __init__(self, qps: Optional[float]):
+        self.min_interval = 1.0 / qps if qps and qps > 0 else 0.0
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        """다음 요청 슬롯을 예약하고, 그 시각이 될 때까지 대기합니다."""
+        if self.min_interval <= 0:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.min_interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
 def run_batch_processing(args: argparse.Namespace, model_obj: Any):
     """입력 파일에서 레코드를 읽어 처리하고, 출력 파일에 저장합니다."""
     if not args.output:
         raise ValueError("--input 사용 시에는 반드시 --output을 지정해야 합니다.")
 
     records = read_jsonl(args.input)
-    results: List[Dict[str, Any]] = []
-
-    last_request_time = 0.0
-    min_interval = 1.0 / args.qps if args.qps and args.qps > 0 else 0.0
+    limiter = _RateLimiter(args.qps)
 
     print(
         f"'{args.input}' 파일의 총 {len(records)}개 레코드에 대한 배치 처리를 시작합니다..."
     )
 
-    for idx, rec in enumerate(records, start=1):
-        # 1. API 요청 속도 제어
-        now = time.time()
-        if min_interval > 0 and now - last_request_time < min_interval:
-            time.sleep(min_interval - (now - last_request_time))
+    def process(idx: int, rec: Dict[str, Any]) -> Dict[str, Any]:
+        # 1. API 요청 속도 제어 (모든 작업 스레드가 같은 제한을 공유)
+        limiter.wait()
 
         # 2. 핵심 로직 호출 및 예외 처리
         try:
@@ -94,21 +112,26 @@ def run_batch_processing(args: argparse.Namespace, model_obj: Any):
             processed_result["meta"].update(
                 {"model": args.model, "temperature": args.temperature}
             )
-            results.append(processed_result)
+            return processed_result
 
         except Exception as e:
             print(f"오류 발생 (레코드 {idx}, ID: {rec.get('id', 'N/A')}): {e}")
             # 실패한 경우, 에러 정보를 결과에 기록하고 계속 진행
-            results.append(
-                {
-                    "id": rec.get("id"),
-                    "mode": args.mode,
-                    "error": str(e),
-                    "original_record": rec,
-                }
-            )
-
-        last_request_time = time.time()
+            return {
+                "id": rec.get("id"),
+                "mode": args.mode,
+                "error": str(e),
+                "original_record": rec,
+            }
+
+    # 네트워크 대기 시간 동안 다른 요청을 보내도록 스레드 풀에서 동시에 처리
+    # (executor.map은 입력 순서대로 결과를 돌려줌)
+    with concurrent.futures.ThreadPoolExecutor(
+        max_workers=max(1, args.workers)
+    ) as executor:
+        results: List[Dict[str, Any]] = list(
+            executor.map(process, range(1, len(records) + 1), records)
+        )
 
     # 3. 최종 결과 저장
     write_jsonl(args.output, results)
@@ -136,7 +159,7 @@ def run_single_processing(args: argparse.Namespace, model_obj: Any):
         print(json.dumps(error_output, ensure_ascii=False, indent=2))
 
 
-def main():
+def main(argv: Optional[List[str]] = None):
     """메인 함수: 인자를 파싱하고 전체 프로세스를 조율합니다."""
     parser = argparse.ArgumentParser(
         description="Gemini 모델을 사용하여 Multi-hop 질문을 Single-hop으로 변환합니다.",
@@ -192,8 +215,15 @@ def main():
         type=float,
         help="초당 최대 요청(Queries Per Second) 수를 제한합니다 (예: 1.5).",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="배치 처리 시 동시에 보낼 최대 요청 수 (기본 1: 순차 처리).\n"
+        "2 이상이면 제공자 rate limit에 맞게 --qps도 함께 지정하세요.",
+    )
 
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
 
     if not args.input and not args.question:
         parser.error(
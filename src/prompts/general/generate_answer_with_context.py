@@ -1,6 +1,8 @@
 def build_prompt(original_query: str, context_json_string: str) -> str:
     """
     최종 질문과 JSON 컨텍스트 문자열을 받아 API 프롬프트를 생성합니다.
+    고정 지시문과 예시를 앞에, 매번 바뀌는 컨텍스트/질문을 맨 뒤에 두어
+    프롬프트 캐싱이 공통 prefix를 재사용할 수 있게 합니다.
     """
     prompt_template = """You will be given a JSON object as a string which contains a series of related search queries and their retrieved documents ('hits'). Do not make answer from external knowledge. You must make answer inside of Context.
 Your main task is to answer the specific 'Question' provided below. Use the entire JSON data as context to formulate your answer, paying close attention to the 'text' fields within the 'hits' lists.
@@ -25,13 +27,6 @@ If the 'Question' is in English, format your answer in English as follows, If En
 
 ##Conclusion##
 
---- Context ---
-{context}
-
---- Question ---
-{query}
-
-
 <--- Example Start--->
 
 --- Question ---
@@ -105,5 +100,11 @@ To realize clinical benefits responsibly, it is crucial to implement ethical saf
 ##결론## 
 소비자는 콘텐츠의 가치 유형과 형식에 따라 AIGC와 AI 사용 공개에 상이한 태도를 보인다. 뉴스 같은 정보성 콘텐츠에서는 투명성과 진정성 확보 노력이 필수적하며, 쾌락적 영역에서는 경험 개선을 위한 활용이 가능하다. 향후 AI 활용의 신뢰도를 높이기 위해 진정성 강화 및 투명성 제고 방안을 지속적으로 모색해야 한다.
 <--- Example End --->
+
+--- Context ---
+{context}
+
+--- Question ---
+{query}
 """
     return prompt_template.format(context=context_json_string, query=original_query)
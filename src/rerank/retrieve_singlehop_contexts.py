@@ -24,11 +24,21 @@ from __future__ import annotations
 import argparse
 import json
 import os
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 import numpy as np
 import pandas as pd
 
+try:
+    import orjson
+
+    _HAS_ORJSON = True
+except ImportError:
+    _HAS_ORJSON = False
+
+# build_vectordb_search / retrieval_system.data_loader가 CSV 옆에 쓰는 임베딩 캐시
+EMBEDDINGS_SIDECAR_SUFFIX = ".f32.npy"
+
 # -------------------------------
 # VectorDB / Retriever (사용자 예시 기반)
 # -------------------------------
@@ -39,23 +49,64 @@ def load_config(config_path: str) -> Dict[str, Any]:
         return json.load(f)
 
 
-def load_vdb(output_file: str) -> pd.DataFrame:
-    """CSV 또는 JSONL에서 VectorDB 불러오기. embedding은 np.array로."""
-    if output_file.endswith(".csv"):
+def _parse_embedding_str(s: str) -> np.ndarray:
+    """'[0.1, 0.2, ...]' 형태의 문자열을 eval 없이 float32 벡터로 변환."""
+    return np.fromstring(s.strip()[1:-1], sep=",", dtype=np.float32)
+
+
+def _load_csv_sidecar(output_file: str) -> Optional[Tuple[pd.DataFrame, np.ndarray]]:
+    """
+    `<csv>.f32.npy` sidecar(build_vectordb_search / retrieval_system.data_loader가
+    기록)가 있고 CSV보다 오래되지 않았으며 행 수가 같을 때만 사용.
+    조건이 맞지 않으면 None (CSV 문자열 파싱으로 대체).
+    """
+    sidecar = output_file + EMBEDDINGS_SIDECAR_SUFFIX
+    if not os.path.exists(sidecar):
+        return None
+    if os.path.getmtime(sidecar) < os.path.getmtime(output_file):
+        print(f"[WARN] Stale embedding sidecar ignored: {sidecar}")
+        return None
+    df = pd.read_csv(output_file, encoding="utf-8", usecols=lambda c: c != "embedding")
+    embeddings = np.load(sidecar, mmap_mode="r")
+    if embeddings.ndim != 2 or embeddings.shape[0] != len(df):
+        print(
+            f"[WARN] Embedding sidecar rows ({embeddings.shape[0]}) do not match "
+            f"CSV rows ({len(df)}); parsing the CSV instead: {sidecar}"
+        )
+        return None
+    return df, embeddings
+
+
+def load_vdb(output_file: str) -> Tuple[pd.DataFrame, np.ndarray]:
+    """
+    CSV 또는 JSONL에서 VectorDB 불러오기.
+    embedding 컬럼은 DataFrame에서 분리해 (N, D) float32 행렬로 함께 반환.
+    CSV와 맞는 `<csv>.f32.npy` sidecar가 있으면 문자열 파싱 없이 memory-map으로 읽음.
+    """
+    loaded = _load_csv_sidecar(output_file) if output_file.endswith(".csv") else None
+    if loaded is not None:
+        df, embeddings = loaded
+    elif output_file.endswith(".csv"):
         df = pd.read_csv(output_file, encoding="utf-8")
-        df["embedding"] = df["embedding"].apply(lambda x: np.array(eval(x)))
+        emb_col = df["embedding"].to_numpy()
+        embeddings = np.vstack([_parse_embedding_str(s) for s in emb_col])
     elif output_file.endswith(".jsonl"):
-        import jsonlines
-
+        loads = orjson.loads if _HAS_ORJSON else json.loads
         records = []
-        with jsonlines.open(output_file, "r") as reader:
-            for row in reader:
-                row["embedding"] = np.array(row["embedding"])
+        emb_rows = []
+        with open(output_file, "rb") as f:
+            for raw in f:
+                if not raw.strip():
+                    continue
+                row = loads(raw)
+                emb_rows.append(row.pop("embedding"))
                 records.append(row)
         df = pd.DataFrame(records)
+        embeddings = np.asarray(emb_rows, dtype=np.float32)
     else:
         raise ValueError("Unsupported format. Use CSV or JSONL.")
-    return df
+    df = df.drop(columns=["embedding"], errors="ignore")
+    return df, embeddings
 
 
 def build_encoder(model_name: str):
@@ -64,44 +115,66 @@ def build_encoder(model_name: str):
     return SentenceTransformer(model_name)
 
 
-def cosine_topk(query_vec: np.ndarray, mat: np.ndarray, k: int) -> np.ndarray:
+def l2_normalize_rows(mat: np.ndarray, eps: float = 1e-12) -> np.ndarray:
+    """(N, D) 행렬의 각 행을 단위 벡터로 정규화 (float32)."""
+    mat = np.asarray(mat, dtype=np.float32)
+    return mat / (np.linalg.norm(mat, axis=1, keepdims=True) + eps)
+
+
+def cosine_topk(query_vec: np.ndarray, mat_norm: np.ndarray, k: int) -> np.ndarray:
     # cosine_similarity(query, mat)
     # = (q·x) / (||q||*||x||) ; sklearn 없이 직접 계산
+    # mat_norm은 로드 시 l2_normalize_rows로 미리 정규화된 행렬이어야 함
     eps = 1e-12
     q = query_vec / (np.linalg.norm(query_vec) + eps)
-    m = mat / (np.linalg.norm(mat, axis=1, keepdims=True) + eps)
-    sims = (m @ q.reshape(-1, 1)).ravel()
-    idx = np.argsort(sims)[::-1][:k]
+    sims = mat_norm @ q
+    # O(N) 선택 후 k개만 정렬
+    k = min(k, sims.shape[0])
+    part = np.argpartition(-sims, k - 1)[:k]
+    idx = part[np.argsort(-sims[part])]
     return idx, sims[idx]
 
 
+class Retriever:
+    """설정 파일 기준으로 VectorDB와 인코더를 한 번만 로드하고 질의마다 재사용."""
+
+    def __init__(self, config_path: str):
+        # 1) 설정 불러오기
+        config = load_config(config_path)
+        output_file = config.get("output_file")
+        if not output_file or not os.path.exists(output_file):
+            raise FileNotFoundError("❌ VectorDB not found. 먼저 main.py로 생성하세요.")
+
+        # 2) DB 로드
+        self.df, embeddings = load_vdb(output_file)
+        # 문서 임베딩은 고정이므로 정규화는 로드 시 한 번만 수행
+        self.embeddings_norm = l2_normalize_rows(embeddings)
+
+        # 3) 모델 로드
+        self.model = build_encoder(config["model_name"])
+
+    def query(self, text: str, top_k: int = 5) -> pd.DataFrame:
+        # 쿼리 임베딩
+        query_emb = self.model.encode([text], convert_to_numpy=True)[0]  # (D,)
+
+        # 유사도 Top-K
+        top_idx, top_sims = cosine_topk(query_emb, self.embeddings_norm, k=top_k)
+
+        # 결과 정리
+        out = self.df.iloc[top_idx].copy().reset_index(drop=True)
+        out.insert(0, "similarity", top_sims)  # 맨 앞 열로 similarity 추가
+        # text/id 필드는 VDB 스키마에 맞춰 조정
+        cols = [
+            c for c in ["similarity", "id", "text", "title", "url"] if c in out.columns
+        ]
+        if "similarity" not in cols:
+            cols = ["similarity"] + cols
+        return out[cols]
+
+
 def retrieve_topk(query: str, config_path: str, top_k: int = 5) -> pd.DataFrame:
-    # 1) 설정 불러오기
-    config = load_config(config_path)
-    output_file = config.get("output_file")
-    if not output_file or not os.path.exists(output_file):
-        raise FileNotFoundError("❌ VectorDB not found. 먼저 main.py로 생성하세요.")
-
-    # 2) DB 로드
-    df = load_vdb(output_file)
-
-    # 3) 모델 로드 & 쿼리 임베딩
-    model_name = config["model_name"]
-    model = build_encoder(model_name)
-    query_emb = model.encode([query], convert_to_numpy=True)[0]  # (D,)
-
-    # 4) 유사도 Top-K
-    embeddings = np.stack(df["embedding"].to_numpy())  # (N, D)
-    top_idx, top_sims = cosine_topk(query_emb, embeddings, k=top_k)
-
-    # 5) 결과 정리
-    out = df.iloc[top_idx].copy().reset_index(drop=True)
-    out.insert(0, "similarity", top_sims)  # 맨 앞 열로 similarity 추가
-    # text/id 필드는 VDB 스키마에 맞춰 조정
-    cols = [c for c in ["similarity", "id", "text", "title", "url"] if c in out.columns]
-    if "similarity" not in cols:
-        cols = ["similarity"] + cols
-    return out[cols]
+    """단발성 호출용. 여러 질의를 처리할 때는 Retriever를 한 번 만들어 재사용할 것."""
+    return Retriever(config_path).query(query, top_k=top_k)
 
 
 # -------------------------------
@@ -182,13 +255,15 @@ def main():
     if args.limit:
         records = records[: args.limit]
 
+    retriever = Retriever(args.config)
+
     enriched: List[Dict[str, Any]] = []
     for rec in records:
         single_hops = extract_singlehop_questions(rec)
         retr_all = []
         for q in single_hops:
             try:
-                df = retrieve_topk(q, config_path=args.config, top_k=args.topk)
+                df = retriever.query(q, top_k=args.topk)
                 docs = df.to_dict(orient="records")
             except Exception as e:
                 docs = [{"error": str(e)}]
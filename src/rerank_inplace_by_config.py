@@ -3,6 +3,7 @@ import re
 import os
 import json
 import argparse
+import functools
 import time
 from typing import List, Tuple
 
@@ -56,6 +57,15 @@ def extract_title_abstract(text: str) -> Tuple[str, str]:
     return title, abstract
 
 
+@functools.lru_cache(maxsize=None)
+def _label_rx(label: str) -> re.Pattern:
+    """'{label}: ...' 블록용 정규식 (후보 문서마다 다시 컴파일하지 않도록 캐시)."""
+    return re.compile(
+        rf"^\s*{re.escape(label)}\s*:\s*(.+?)(?=^\s*[A-Za-z].*?:|\Z)",
+        re.IGNORECASE | re.MULTILINE | re.DOTALL,
+    )
+
+
 def build_embedding_text(
     candidate_text: str, embedding_mode: str, fallback_fields: List[str] = None
 ) -> str:
@@ -73,11 +83,7 @@ def build_embedding_text(
     if fallback_fields:
         parts = []
         for label in fallback_fields:
-            rx = re.compile(
-                rf"^\s*{re.escape(label)}\s*:\s*(.+?)(?=^\s*[A-Za-z].*?:|\Z)",
-                re.IGNORECASE | re.MULTILINE | re.DOTALL,
-            )
-            m = rx.search(candidate_text or "")
+            m = _label_rx(label).search(candidate_text or "")
             if m:
                 parts.append(m.group(1).strip())
         if parts:
@@ -159,6 +165,10 @@ def rerank_inplace(
     # 후보 임베딩 + 재정렬
     log("🔁 Reranking within row (placing best at _1 … worst at _50)…")
     R = len(df)
+    # 후보 값 블록 (R, C)을 한 번만 추출해 두고, 재정렬 후 한 번에 다시 씀
+    col_idx = df.columns.get_indexer(article_cols)
+    block = df.iloc[:, col_idx].to_numpy(copy=True)
+    orders = np.empty((R, len(article_cols)), dtype=np.intp)
     for i in range(R):
         # 후보 임베딩 (행 단위)
         c_start = time.time()
@@ -169,19 +179,16 @@ def rerank_inplace(
 
         # 유사도 계산 → 내림차순 인덱스
         sims = cosine_sim_vector_to_matrix(q_embs[i], cand_embs)  # (C,)
-        order = np.argsort(-sims)
-
-        # 같은 행 내부에서 article_cols 순서만 바꿔 끼우기
-        original_values = [df.at[df.index[i], c] for c in article_cols]
-        reordered_values = [original_values[idx] for idx in order]
-        for j, col in enumerate(article_cols):
-            df.at[df.index[i], col] = reordered_values[j]
+        orders[i] = np.argsort(-sims)
 
         # 진행 로그
         took = time.time() - c_start
         if (i + 1) % 50 == 0 or (i + 1) == R:
             log(f"  • processed {i + 1}/{R} rows (last row took {took:.2f}s)")
 
+    # 같은 행 내부에서 article_cols 순서만 바꿔 끼우기
+    df.iloc[:, col_idx] = np.take_along_axis(block, orders, axis=1)
+
     log(f"✅ Reranking done in {time.time() - start:.2f}s total")
     return df
 
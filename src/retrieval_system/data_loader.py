@@ -3,29 +3,73 @@
 
 from __future__ import annotations
 
-import ast
 import csv
 import dataclasses
 import json
 import os
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, NamedTuple, Optional
 
 import numpy as np
 from retrieval_system import utils
 
+try:
+    import orjson
 
-@dataclasses.dataclass
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+    import pyarrow.parquet as pq
+
+    _HAS_PYARROW = True
+except ImportError:
+    _HAS_PYARROW = False
+
+# Sidecar suffixes for the binary cache written next to a VectorDB CSV.
+EMBEDDINGS_CACHE_SUFFIX = ".f32.npy"
+METADATA_CACHE_SUFFIX = ".meta.parquet"
+# Parquet schema metadata key holding the "<size>:<mtime_ns>" of the source CSV.
+SOURCE_STAT_KEY = b"source_csv_stat"
+
+
+def _source_stat(csv_path: str) -> bytes:
+    """Fingerprint of the CSV the cache was built from (size and mtime in ns)."""
+    st = os.stat(csv_path)
+    return f"{st.st_size}:{st.st_mtime_ns}".encode("ascii")
+
+
+@dataclasses.dataclass(slots=True)
 class VectorDB:
-    """In-memory vector database loaded from a CSV."""
+    """
+    In-memory vector database loaded from a CSV.
+
+    Stored column-wise (SoA): hits are gathered with one fancy-index per column
+    instead of per-row dict lookups.
+    """
 
-    doc_ids: List[str]
-    embeddings: np.ndarray  # (N, D), float32, L2-normalized
-    metadata: List[Dict[str, Any]]
+    doc_ids: np.ndarray  # (N,), object (str)
+    embeddings: np.ndarray  # (N, D), float32, C-contiguous, L2-normalized
+    metadata_columns: Dict[str, np.ndarray]  # column -> (N,) object (str) array
 
+    @property
+    def metadata(self) -> List[Dict[str, Any]]:
+        """Row-wise view of `metadata_columns` (builds N dicts; avoid in hot paths)."""
+        cols = list(self.metadata_columns.items())
+        return [
+            {name: values[i] for name, values in cols} for i in range(len(self.doc_ids))
+        ]
 
-@dataclasses.dataclass
-class QuestionItem:
-    """Represents a single question with its decomposed parts."""
+
+class QuestionItem(NamedTuple):
+    """
+    Represents a single question with its decomposed parts.
+
+    A NamedTuple rather than a dataclass: no per-instance `__dict__`, and
+    fields are read by tuple slot index.
+    """
 
     qid: str
     original_question: str
@@ -44,16 +88,150 @@ def load_schema(schema_path: str) -> Dict[str, str]:
         raise ValueError(f"Schema file '{schema_path}' is not valid JSON.")
 
 
+def _parse_embedding_str(embedding_str: str) -> np.ndarray:
+    """
+    Parses a '[0.1, 0.2, ...]' string with NumPy's C parser (no Python eval).
+    Malformed strings yield an empty vector, surfaced later as a dimension error.
+    """
+    try:
+        return np.fromstring(embedding_str.strip()[1:-1], sep=",", dtype=np.float32)
+    except ValueError:
+        return np.empty(0, dtype=np.float32)
+
+
+def _parse_embedding_strs(embedding_strs: List[str], csv_path: str) -> np.ndarray:
+    """
+    Parses stringified embeddings straight into a preallocated (N, D) float32
+    buffer, where D is taken from the first row.
+    """
+    first = _parse_embedding_str(embedding_strs[0])
+    first_dim = first.shape[0]
+    embs_arr = np.empty((len(embedding_strs), first_dim), dtype=np.float32)
+    embs_arr[0] = first
+    for i in range(1, len(embedding_strs)):
+        emb = _parse_embedding_str(embedding_strs[i])
+        # Check for consistent embedding dimensions to prevent downstream errors.
+        if emb.shape[0] != first_dim:
+            raise ValueError(
+                f"Inconsistent embedding dimension in '{csv_path}'. "
+                f"Row {i + 2} (header is row 1) has dimension {emb.shape[0]}, "
+                f"but the first data row has dimension {first_dim}. "
+                "Please ensure all embeddings are generated with the same model."
+            )
+        embs_arr[i] = emb
+    return embs_arr
+
+
+def _load_vectordb_cache(
+    csv_path: str, doc_id_col: str, metadata_cols: List[str]
+) -> Optional[VectorDB]:
+    """
+    Loads the binary sidecar cache for `csv_path` if it was built from a CSV
+    with exactly the current size and mtime and covers the requested columns;
+    returns None otherwise. Comparing the recorded stat (rather than checking
+    that the cache is newer) also catches CSVs restored with `cp -p`/rsync.
+    """
+    emb_path = csv_path + EMBEDDINGS_CACHE_SUFFIX
+    meta_path = csv_path + METADATA_CACHE_SUFFIX
+    if not (_HAS_PYARROW and os.path.exists(emb_path) and os.path.exists(meta_path)):
+        return None
+    schema_meta = pq.read_schema(meta_path).metadata or {}
+    if schema_meta.get(SOURCE_STAT_KEY) != _source_stat(csv_path):
+        return None
+
+    table = pq.read_table(meta_path)
+    if not {doc_id_col, *metadata_cols}.issubset(table.column_names):
+        return None
+    # Stored already L2-normalized; pages fault in on demand.
+    embeddings = np.load(emb_path, mmap_mode="r")
+    if embeddings.ndim != 2 or embeddings.shape[0] != table.num_rows:
+        return None
+
+    def column(name: str) -> np.ndarray:
+        return table.column(name).to_numpy(zero_copy_only=False).astype(object)
+
+    return VectorDB(
+        doc_ids=column(doc_id_col),
+        embeddings=embeddings,
+        metadata_columns={key: column(key) for key in metadata_cols},
+    )
+
+
+def _save_vectordb_cache(
+    csv_path: str, doc_id_col: str, vectordb: VectorDB, source_stat: bytes
+) -> None:
+    """
+    Writes the binary sidecar cache for `csv_path`, tagged with the stat of the
+    CSV it was parsed from; failures only warn.
+    """
+    if not _HAS_PYARROW:
+        return
+    try:
+        np.save(csv_path + EMBEDDINGS_CACHE_SUFFIX, vectordb.embeddings)
+        table = pa.table(
+            {
+                doc_id_col: pa.array(vectordb.doc_ids.tolist(), type=pa.string()),
+                **{
+                    key: pa.array(values.tolist(), type=pa.string())
+                    for key, values in vectordb.metadata_columns.items()
+                },
+            }
+        ).replace_schema_metadata({SOURCE_STAT_KEY: source_stat})
+        pq.write_table(table, csv_path + METADATA_CACHE_SUFFIX)
+    except (OSError, pa.ArrowException) as e:
+        print(f"[WARN] Could not write VectorDB cache for '{csv_path}': {e}")
+
+
+def _read_csv_columns(csv_path: str, columns: List[str]) -> Dict[str, List[str]]:
+    """
+    Reads the given CSV columns as lists of strings ('' for empty fields).
+
+    Uses pyarrow's multi-threaded CSV reader with every column typed as string
+    when available, otherwise Python's built-in csv module. Either way there is
+    no type inference, unlike pandas.
+    """
+    with open(csv_path, "r", encoding="utf-8", newline="") as f:
+        header = next(csv.reader(f), [])
+
+    # Validate CSV header against the schema
+    missing_cols = set(columns) - set(header)
+    if missing_cols:
+        raise ValueError(
+            f"CSV file is missing required columns from schema: {missing_cols}"
+        )
+
+    if _HAS_PYARROW:
+        table = pacsv.read_csv(
+            csv_path,
+            parse_options=pacsv.ParseOptions(newlines_in_values=True),
+            convert_options=pacsv.ConvertOptions(
+                column_types={col: pa.string() for col in columns},
+                include_columns=columns,
+            ),
+        )
+        return {col: table.column(col).fill_null("").to_pylist() for col in columns}
+
+    values: Dict[str, List[str]] = {col: [] for col in columns}
+    with open(csv_path, "r", encoding="utf-8", newline="") as f:
+        for row in csv.DictReader(f):
+            for col in columns:
+                values[col].append(row.get(col) or "")
+    return values
+
+
 def load_vectordb_from_csv(csv_path: str, schema_path: str) -> VectorDB:
     """
-    Loads a vector database from a CSV file using Python's built-in csv module.
+    Loads a vector database from a CSV file, reading every column as a string.
     This approach avoids pandas' automatic type inference, providing more robust parsing.
+
+    The first load also writes `<csv>.f32.npy` (normalized embeddings) and
+    `<csv>.meta.parquet` (doc ids + metadata) next to the CSV; later loads
+    memory-map those instead of parsing the CSV again.
     """
     if not os.path.exists(csv_path):
         raise FileNotFoundError(f"VectorDB CSV not found: {csv_path}")
 
     schema = load_schema(schema_path)
-    schema_columns = set(schema.keys())
 
     # --- Identify key columns based on convention ---
     embedding_col = "embedding"
@@ -72,80 +250,61 @@ def load_vectordb_from_csv(csv_path: str, schema_path: str) -> VectorDB:
         col for col in schema.keys() if col not in [doc_id_col, embedding_col]
     ]
 
-    # --- Read data using the csv module ---
-    doc_ids_list: List[str] = []
-    embeddings_list: List[List[float]] = []
-    metadata_list: List[Dict[str, Any]] = []
-
-    with open(csv_path, "r", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-
-        # Validate CSV header against the schema
-        csv_columns = set(reader.fieldnames or [])
-        if not schema_columns.issubset(csv_columns):
-            missing_cols = schema_columns - csv_columns
-            raise ValueError(
-                f"CSV file is missing required columns from schema: {missing_cols}"
-            )
-
-        for row in reader:
-            # Document ID (empty string if not present)
-            doc_ids_list.append(row.get(doc_id_col, ""))
-
-            # Embedding (safely parse string representation)
-            embedding_str = row.get(embedding_col) or "[]"
-            try:
-                embeddings_list.append(ast.literal_eval(embedding_str))
-            except (ValueError, SyntaxError):
-                embeddings_list.append([])  # Add empty list on parsing error
-
-            # Metadata (all other schema columns)
-            # An empty field in the CSV is read as an empty string '', which is what we want.
-            metadata_item = {key: row.get(key, "") for key in metadata_cols}
-            metadata_list.append(metadata_item)
+    cached = _load_vectordb_cache(csv_path, doc_id_col, metadata_cols)
+    if cached is not None:
+        return cached
+    # Taken before parsing so a CSV rewritten mid-load is not cached as current
+    source_stat = _source_stat(csv_path)
+
+    # --- Read data (every column as a plain string) ---
+    columns = _read_csv_columns(csv_path, [doc_id_col, embedding_col, *metadata_cols])
+    doc_ids_list = columns[doc_id_col]
+    # Embedding (raw string; parsed in bulk below)
+    embedding_strs = columns[embedding_col]
+    # An empty field in the CSV is read as an empty string '', which is what we want.
+    metadata_lists = {key: columns[key] for key in metadata_cols}
     # --- End of data reading ---
 
     # --- Validate and Convert Embeddings ---
     embs_arr = np.array([])
-    if embeddings_list:
-        # Check for consistent embedding dimensions to prevent downstream errors.
-        first_dim = len(embeddings_list[0])
-        for i, emb in enumerate(embeddings_list[1:], 1):
-            if len(emb) != first_dim:
-                raise ValueError(
-                    f"Inconsistent embedding dimension in '{csv_path}'. "
-                    f"Row {i + 2} (header is row 1) has dimension {len(emb)}, "
-                    f"but the first data row has dimension {first_dim}. "
-                    "Please ensure all embeddings are generated with the same model."
-                )
-
-        # Convert lists to final, high-performance data structures
-        embs_arr = np.array(embeddings_list, dtype=np.float32)
-        if embs_arr.size > 0:
+    if embedding_strs:
+        embs_arr = _parse_embedding_strs(embedding_strs, csv_path)
+        # Upstream pipelines usually store unit vectors; skip the extra pass then
+        if embs_arr.size > 0 and not utils.is_unit_norm(embs_arr):
             embs_arr = utils.l2_normalize(embs_arr)
     # --- End of Validation ---
 
-    return VectorDB(doc_ids=doc_ids_list, embeddings=embs_arr, metadata=metadata_list)
+    vectordb = VectorDB(
+        doc_ids=np.array(doc_ids_list, dtype=object),
+        embeddings=np.ascontiguousarray(embs_arr, dtype=np.float32),
+        metadata_columns={
+            key: np.array(values, dtype=object) for key, values in metadata_lists.items()
+        },
+    )
+    if vectordb.embeddings.ndim == 2:
+        _save_vectordb_cache(csv_path, doc_id_col, vectordb, source_stat)
+    return vectordb
 
 
 def load_questions_jsonl(path: str) -> List[QuestionItem]:
     """Loads questions from a JSONL file."""
     if not os.path.exists(path):
         raise FileNotFoundError(f"Questions JSONL not found: {path}")
+    with open(path, "rb") as f:
+        lines = f.read().splitlines()
     items: List[QuestionItem] = []
-    with open(path, "r", encoding="utf-8") as f:
-        for line in f:
-            if not line.strip():
-                continue
-            obj = json.loads(line)
-            items.append(
-                QuestionItem(
-                    qid=str(obj.get("id")),
-                    original_question=str(obj.get("original_question", "")),
-                    single_hop_questions=obj.get("single_hop_questions", []) or [],
-                    meta=obj.get("meta", {}) or {},
-                )
+    for line in lines:
+        if not line.strip():
+            continue
+        obj = _json_loads(line)
+        items.append(
+            QuestionItem(
+                str(obj.get("id")),
+                str(obj.get("original_question", "")),
+                obj.get("single_hop_questions", []) or [],
+                obj.get("meta", {}) or {},
             )
+        )
     return items
 
 
@@ -9,52 +9,107 @@ import os
 import sys
 
 # retrieval_system 패키지의 모듈들을 절대 경로로 임포트
-from retrieval_system import data_loader, query_encoder, result_saver, utils
+from retrieval_system import (
+    data_loader,
+    query_cache,
+    query_encoder,
+    result_saver,
+    utils,
+)
 from retrieval_system.retrievers import get_retriever
 
 
-def run_retrieval_for_question(
-    q_item: data_loader.QuestionItem,
+def _build_queries(q_item: data_loader.QuestionItem) -> list[tuple[str, dict]]:
+    """Returns the (text, meta) queries for a question: original + single-hop."""
+    queries = [(q_item.original_question, {"type": "original"})]
+    queries.extend(
+        (q, {"type": "single_hop", "index": i})
+        for i, q in enumerate(q_item.single_hop_questions)
+    )
+    return queries
+
+
+def run_retrieval_for_questions(
+    q_items: list[data_loader.QuestionItem],
     encoder: query_encoder.QueryEncoder,
     index: "retriever_base.Retriever",
     vectordb: data_loader.VectorDB,
     top_k: int,
     model_name: str,
     query_instruction: str | None = None,
-) -> dict[str, any]:
-    """Runs retrieval for a single question item (original + single-hop)."""
-    queries = [(q_item.original_question, {"type": "original"})]
-    queries.extend(
-        (q, {"type": "single_hop", "index": i})
-        for i, q in enumerate(q_item.single_hop_questions)
-    )
+    batch_size: int | None = None,
+) -> list[dict[str, any]]:
+    """
+    Runs retrieval for many question items at once.
+
+    All queries across `q_items` are encoded in one batch and searched with a
+    single index call; the hits are then scattered back into one payload per
+    question, in input order.
+    """
+    per_item_queries = [_build_queries(q_item) for q_item in q_items]
+    all_texts = [q for queries in per_item_queries for q, _ in queries]
+    if not all_texts:
+        return []
 
-    q_texts = [q for q, _ in queries]
-    q_vecs = encoder.encode_queries(q_texts, instruction=query_instruction)
+    q_vecs = encoder.encode_queries(
+        all_texts, instruction=query_instruction, batch_size=batch_size
+    )
     scores, indices = index.search(q_vecs, top_k=top_k)
 
-    results = []
-    for i, (q_text, q_meta) in enumerate(queries):
-        hits = []
-        for k in range(scores.shape[1]):
-            doc_idx = int(indices[i, k])
-            # 동적 메타데이터를 결과에 포함
-            hit_data = {
-                "rank": k + 1,
-                "score": float(scores[i, k]),
-                "doc_id": vectordb.doc_ids[doc_idx],
-                **vectordb.metadata[doc_idx],
-            }
-            hits.append(hit_data)
-        results.append({"query": q_text, "query_meta": q_meta, "hits": hits})
-
-    return {
-        "id": q_item.qid,
-        "model_name": model_name,
-        "retrieval_results": results,
-        "meta": q_item.meta,
+    # Column-wise gather of all hits at once, then convert to Python lists once
+    score_rows = scores.tolist()
+    index_rows = indices.tolist()
+    flat_idx = indices.ravel()
+    doc_id_rows = vectordb.doc_ids[flat_idx].reshape(indices.shape).tolist()
+    meta_rows = {
+        col: values[flat_idx].reshape(indices.shape).tolist()
+        for col, values in vectordb.metadata_columns.items()
     }
 
+    payloads = []
+    offset = 0
+    for q_item, queries in zip(q_items, per_item_queries):
+        results = []
+        for i, (q_text, q_meta) in enumerate(queries, start=offset):
+            # 동적 메타데이터를 결과에 포함 (ANN 인덱스가 채우지 못한 -1 슬롯은 제외)
+            hits = [
+                {
+                    "rank": j + 1,
+                    "score": score_rows[i][j],
+                    "doc_id": doc_id_rows[i][j],
+                    **{col: rows[i][j] for col, rows in meta_rows.items()},
+                }
+                for j, doc_idx in enumerate(index_rows[i])
+                if doc_idx >= 0
+            ]
+            results.append({"query": q_text, "query_meta": q_meta, "hits": hits})
+        offset += len(queries)
+
+        payloads.append(
+            {
+                "id": q_item.qid,
+                "model_name": model_name,
+                "retrieval_results": results,
+                "meta": q_item.meta,
+            }
+        )
+    return payloads
+
+
+def run_retrieval_for_question(
+    q_item: data_loader.QuestionItem,
+    encoder: query_encoder.QueryEncoder,
+    index: "retriever_base.Retriever",
+    vectordb: data_loader.VectorDB,
+    top_k: int,
+    model_name: str,
+    query_instruction: str | None = None,
+) -> dict[str, any]:
+    """Runs retrieval for a single question item (original + single-hop)."""
+    return run_retrieval_for_questions(
+        [q_item], encoder, index, vectordb, top_k, model_name, query_instruction
+    )[0]
+
 
 def main():
     """Main function to parse arguments and run the retrieval pipeline."""
@@ -93,11 +148,35 @@ def main():
         default="auto",
         help="Device for encoding ('auto', 'cpu', 'cuda:0').",
     )
+    p.add_argument(
+        "--backend",
+        default="pt",
+        choices=["pt", "onnx", "openvino"],
+        help="Inference backend for the query encoder (falls back to 'pt').",
+    )
+    p.add_argument(
+        "--model_file",
+        default=None,
+        help="ONNX/OpenVINO file to load, e.g. 'model_O3.onnx' or "
+        "'model_qint8_avx512.onnx' for INT8 on CPU.",
+    )
+    p.add_argument(
+        "--quantize",
+        choices=["none", "fp16", "sq8", "pq"],
+        default=None,
+        help="FAISS vector codec for flat/ivf/hnsw/auto index specs; ignored "
+        "for explicit factory strings (default: config 'quantize' or none).",
+    )
     p.add_argument(
         "--query_instruction",
         default="",
         help="Custom instruction for the query encoder.",
     )
+    p.add_argument(
+        "--query_cache",
+        default=query_cache.DEFAULT_QUERY_CACHE_PATH,
+        help="SQLite file caching encoded queries ('' to disable).",
+    )
     args = p.parse_args()
 
     # --- Load Data and Models ---
@@ -112,8 +191,25 @@ def main():
     print(args.vectordb_csv)
     vectordb = data_loader.load_vectordb_from_csv(args.vectordb_csv, args.schema_json)
     all_questions = data_loader.load_questions_jsonl(args.questions_jsonl)
-    encoder = query_encoder.QueryEncoder(model_name=model_name, device=args.device)
-    retriever = get_retriever(vectordb.embeddings)
+    cache = (
+        query_cache.QueryEmbeddingCache(args.query_cache) if args.query_cache else None
+    )
+    encoder = query_encoder.QueryEncoder(
+        model_name=model_name,
+        device=args.device,
+        cache=cache,
+        backend=args.backend,
+        model_file=args.model_file,
+    )
+    retriever = get_retriever(
+        vectordb.embeddings,
+        index_spec=config.get("index_spec", "flat"),
+        nprobe=config.get("nprobe", 16),
+        source_path=args.vectordb_csv,
+        fp16=config.get("fp16", False),
+        use_gpu=encoder.on_gpu,
+        quantize=args.quantize or config.get("quantize"),
+    )
     print(f"[INFO] Resources loaded successfully.", file=sys.stderr)
 
     # --- Select Questions ---
@@ -136,21 +232,20 @@ def main():
     saver = result_saver.ResultSaver(args.output_root)
     saved_files = []
 
-    for q_item in selected_questions:
-        payload = run_retrieval_for_question(
-            q_item,
-            encoder,
-            retriever,
-            vectordb,
-            args.top_k,
-            model_name,
-            args.query_instruction,
-        )
-        saved_path = saver.save_result(payload)
-        saved_files.append(saved_path)
-        print(
-            f"[OK] Saved result for QID {q_item.qid} to {saved_path}", file=sys.stderr
-        )
+    payloads = run_retrieval_for_questions(
+        selected_questions,
+        encoder,
+        retriever,
+        vectordb,
+        args.top_k,
+        model_name,
+        args.query_instruction,
+    )
+    # The saver logs "[OK] Saved result ..." per file as each write completes
+    for payload in payloads:
+        saved_files.append(saver.save_result(payload))
+
+    saver.close()
 
     print("\n--- Retrieval Complete ---")
     print(f"Output folder: {saver.get_output_folder()}")
@@ -158,6 +253,9 @@ def main():
     for path in saved_files:
         print(f"- {path}")
 
+    if cache is not None:
+        cache.close()
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+"""On-disk cache of encoded query vectors, backed by SQLite."""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import sqlite3
+from typing import Dict, Iterable, Tuple
+
+import numpy as np
+
+from retrieval_system import utils
+
+DEFAULT_QUERY_CACHE_PATH = os.path.join(utils.DEFAULT_CACHE_DIR, "query_embeddings.sqlite")
+
+# SQLite's default limit on host parameters per statement is 999.
+_MAX_PARAMS = 900
+
+
+class QueryEmbeddingCache:
+    """
+    Maps sha1(model_name, instruction, text) to a float32 query vector.
+
+    Vectors are stored as raw float32 bytes, so a hit costs one row read and an
+    `np.frombuffer`, not a transformer forward pass.
+    """
+
+    def __init__(self, path: str = DEFAULT_QUERY_CACHE_PATH):
+        self.path = path
+        utils.ensure_dir(os.path.dirname(os.path.abspath(path)))
+        self._conn = sqlite3.connect(path)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS query_vecs (key TEXT PRIMARY KEY, vec BLOB NOT NULL)"
+        )
+
+    @staticmethod
+    def make_key(model_name: str, instruction: str, text: str) -> str:
+        """Returns the cache key for one query."""
+        h = hashlib.sha1()
+        for part in (model_name, instruction, text):
+            h.update(part.encode("utf-8"))
+            h.update(b"\0")
+        return h.hexdigest()
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, np.ndarray]:
+        """Looks up many keys at once; missing keys are absent from the result."""
+        keys = list(keys)
+        found: Dict[str, np.ndarray] = {}
+        for start in range(0, len(keys), _MAX_PARAMS):
+            batch = keys[start : start + _MAX_PARAMS]
+            placeholders = ",".join("?" * len(batch))
+            rows = self._conn.execute(
+                f"SELECT key, vec FROM query_vecs WHERE key IN ({placeholders})", batch
+            )
+            for key, blob in rows:
+                found[key] = np.frombuffer(blob, dtype=np.float32)
+        return found
+
+    def put_many(self, items: Iterable[Tuple[str, np.ndarray]]) -> None:
+        """Stores (key, vector) pairs, overwriting existing keys."""
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO query_vecs (key, vec) VALUES (?, ?)",
+                (
+                    (key, np.ascontiguousarray(vec, dtype=np.float32).tobytes())
+                    for key, vec in items
+                ),
+            )
+
+    def close(self) -> None:
+        """Closes the underlying SQLite connection."""
+        self._conn.close()
@@ -3,64 +3,267 @@
 
 from __future__ import annotations
 
-from typing import List, Optional
+import sys
+from collections import OrderedDict
+from typing import Dict, List, Literal, Optional, Tuple
 
 import numpy as np
 
 # retrieval_system 패키지의 모듈들을 절대 경로로 임포트
 from retrieval_system import utils
+from retrieval_system.query_cache import QueryEmbeddingCache
 
 
 class QueryEncoder:
     """Wraps a SentenceTransformer model for encoding queries."""
 
-    def __init__(self, model_name: str, device: str = "auto"):
+    def __init__(
+        self,
+        model_name: str,
+        device: str = "auto",
+        cache: Optional[QueryEmbeddingCache] = None,
+        memo_size: int = 10_000,
+        backend: Literal["pt", "onnx", "openvino"] = "pt",
+        model_file: Optional[str] = None,
+    ):
         self.model_name = model_name
         self.device = device
+        self.cache = cache
+        # ONNX/OpenVINO exports (e.g. "model_O3.onnx", "model_qint8_avx512.onnx")
+        self.backend = backend
+        self.model_file = model_file
+        # In-process LRU of encoded queries, in front of the on-disk cache
+        self.memo_size = memo_size
+        self._memo: OrderedDict[str, np.ndarray] = OrderedDict()
+        # instruction -> (lead, tail) token ids (None: cannot be tokenized apart)
+        self._prefix_ids: Dict[str, Optional[Tuple[List[int], List[int]]]] = {}
         self.model = self._load_model()
+        self.on_gpu = self.model.device.type == "cuda"
+        if self.on_gpu and self.backend == "pt":
+            self._optimize_for_gpu()
+        # Quantized exports drift slightly, so cached vectors are keyed per backend
+        self.cache_model_id = (
+            model_name
+            if self.backend == "pt"
+            else f"{model_name}@{self.backend}:{self.model_file or 'default'}"
+        )
+        # Larger batches keep tensor cores busy; CPU gains little beyond 32
+        self.default_batch_size = 128 if self.on_gpu else 32
         # Default instruction for models like Snowflake Arctic Embed
         self.default_instruction = (
             "Represent this sentence for searching relevant passages: "
         )
 
     def _load_model(self):
-        """Loads the SentenceTransformer model."""
+        """Loads the SentenceTransformer model, falling back to PyTorch if needed."""
         try:
             from sentence_transformers import SentenceTransformer
-
-            return SentenceTransformer(
-                self.model_name,
-                trust_remote_code=True,
-                device=None if self.device == "auto" else self.device,
-            )
         except ImportError:
             raise ImportError(
                 "SentenceTransformers is not installed. Please install it with "
                 "'pip install sentence-transformers'."
             )
+
+        kwargs = dict(
+            trust_remote_code=True,
+            device=None if self.device == "auto" else self.device,
+        )
+        if self.backend != "pt":
+            try:
+                return SentenceTransformer(
+                    self.model_name,
+                    backend=self.backend,
+                    model_kwargs=(
+                        {"file_name": self.model_file} if self.model_file else None
+                    ),
+                    **kwargs,
+                )
+            except Exception as e:
+                print(
+                    f"[WARN] Could not load '{self.model_name}' with backend "
+                    f"'{self.backend}', falling back to PyTorch: {e}",
+                    file=sys.stderr,
+                )
+                self.backend, self.model_file = "pt", None
+        try:
+            return SentenceTransformer(self.model_name, **kwargs)
         except Exception as e:
             raise RuntimeError(f"Failed to load model '{self.model_name}': {e}")
 
+    def _optimize_for_gpu(self) -> None:
+        """Switches the model to FP16 and compiles the transformer forward pass."""
+        import torch
+
+        # Outputs are cast back to float32 and re-normalized in _encode if needed.
+        self.model.half()
+        auto_model = getattr(self.model[0], "auto_model", None)
+        if auto_model is None or not hasattr(torch, "compile"):
+            return
+        try:
+            # dynamic=True: query batches vary in sequence length
+            self.model[0].auto_model = torch.compile(auto_model, dynamic=True)
+        except Exception as e:
+            print(f"[WARN] torch.compile failed, using eager mode: {e}", file=sys.stderr)
+
     def encode_queries(
-        self, queries: List[str], instruction: Optional[str] = None
+        self,
+        queries: List[str],
+        instruction: Optional[str] = None,
+        batch_size: Optional[int] = None,
     ) -> np.ndarray:
         """
         Encodes a list of query strings into a numpy array of embeddings.
         Returns L2-normalized (Q, D) float32 array.
+        `batch_size` defaults to 128 on GPU and 32 on CPU.
         """
+        batch_size = batch_size or self.default_batch_size
         # Use the provided instruction, the default one, or none if explicitly empty
         final_instruction = (
             instruction if instruction is not None else self.default_instruction
         )
 
-        prefixed_queries = [final_instruction + q for q in queries]
+        if not queries:
+            dim = self.model.get_sentence_embedding_dimension()
+            return np.empty((0, dim), dtype=np.float32)
 
-        q_vecs = self.model.encode(
-            prefixed_queries,
-            batch_size=32,
-            normalize_embeddings=False,  # We normalize manually
-            convert_to_numpy=True,
-            show_progress_bar=False,
-        ).astype(np.float32)
+        # Lookup order: in-process LRU -> on-disk cache -> model (once per text)
+        keys = [
+            QueryEmbeddingCache.make_key(self.cache_model_id, final_instruction, q)
+            for q in queries
+        ]
+        vecs = {}
+        for k in keys:
+            if k in self._memo:
+                self._memo.move_to_end(k)
+                vecs[k] = self._memo[k]
+        misses = {k: q for k, q in zip(keys, queries) if k not in vecs}
+        if misses and self.cache is not None:
+            from_disk = self.cache.get_many(misses)
+            vecs.update(from_disk)
+            self._remember(from_disk.items())
+            misses = {k: q for k, q in misses.items() if k not in from_disk}
+        if misses:
+            miss_keys = list(misses)
+            miss_vecs = self._encode(
+                [misses[k] for k in miss_keys], final_instruction, batch_size=batch_size
+            )
+            if self.cache is not None:
+                self.cache.put_many(zip(miss_keys, miss_vecs))
+            vecs.update(zip(miss_keys, miss_vecs))
+            self._remember(zip(miss_keys, miss_vecs))
+        return np.stack([vecs[k] for k in keys])
+
+    def _remember(self, items) -> None:
+        """Adds (key, vector) pairs to the in-process LRU, evicting the oldest."""
+        for k, v in items:
+            self._memo[k] = v
+            self._memo.move_to_end(k)
+        while len(self._memo) > self.memo_size:
+            self._memo.popitem(last=False)
 
+    def _prefix_token_ids(
+        self, instruction: str
+    ) -> Optional[Tuple[List[int], List[int]]]:
+        """
+        Tokenizes `instruction` once and caches it as (lead, tail) token ids.
+
+        A query is then encoded as `lead + query_ids + tail`, where `lead` holds
+        the leading special tokens plus the instruction and `tail` the trailing
+        special tokens. Returns None (use plain string encoding) when there is
+        no instruction, the backend is not PyTorch, or tokenizing the prefix
+        separately would not reproduce the tokens of the concatenated string.
+        """
+        if instruction in self._prefix_ids:
+            return self._prefix_ids[instruction]
+        frame = None
+        tokenizer = getattr(self.model, "tokenizer", None)
+        if instruction and self.backend == "pt" and tokenizer is not None:
+            probe = "what is the boiling point of water"
+            probe_ids = tokenizer(probe, add_special_tokens=False)["input_ids"]
+            with_special = tokenizer(probe)["input_ids"]
+            n = len(probe_ids)
+            # Locate the probe inside its special tokens to learn head/tail
+            pos = next(
+                (
+                    i
+                    for i in range(len(with_special) - n + 1)
+                    if with_special[i : i + n] == probe_ids
+                ),
+                None,
+            )
+            if pos is not None:
+                ids = tokenizer(instruction, add_special_tokens=False)["input_ids"]
+                lead = with_special[:pos] + ids
+                tail = with_special[pos + n :]
+                full_ids = tokenizer(instruction + probe)["input_ids"]
+                if lead + probe_ids + tail == full_ids:
+                    frame = (lead, tail)
+        self._prefix_ids[instruction] = frame
+        return frame
+
+    def _encode(
+        self, queries: List[str], instruction: str, batch_size: int
+    ) -> np.ndarray:
+        """Encodes `instruction + query` texts; returns L2-normalized float32."""
+        frame = self._prefix_token_ids(instruction)
+        if frame is not None:
+            q_vecs = self._encode_with_prefix_ids(queries, *frame, batch_size)
+        else:
+            q_vecs = self.model.encode(
+                [instruction + q for q in queries],
+                batch_size=batch_size,
+                normalize_embeddings=True,  # Fused into the model's last op
+                convert_to_numpy=True,
+                show_progress_bar=False,
+            ).astype(np.float32, copy=False)
+
+        # FP16 outputs can drift off unit norm; fix them up on the CPU only then
+        if utils.is_unit_norm(q_vecs):
+            return q_vecs
         return utils.l2_normalize(q_vecs)
+
+    def _encode_with_prefix_ids(
+        self, queries: List[str], lead: List[int], tail: List[int], batch_size: int
+    ) -> np.ndarray:
+        """
+        Encodes queries whose instruction prefix is already tokenized.
+
+        Only the raw queries go through the tokenizer; the cached prefix ids are
+        spliced in and each length-sorted batch is padded into a preallocated
+        id matrix that is fed straight to the model's forward pass.
+        """
+        import torch
+
+        tokenizer = self.model.tokenizer
+        # Same truncation as encoding the full string: the prefix is kept whole
+        budget = max(1, self.model.max_seq_length - len(lead) - len(tail))
+        rows = [
+            lead + ids + tail
+            for ids in tokenizer(
+                queries, add_special_tokens=False, truncation=True, max_length=budget
+            )["input_ids"]
+        ]
+        pad_id = tokenizer.pad_token_id or 0
+        order = np.argsort([-len(r) for r in rows], kind="stable")
+        out: Optional[np.ndarray] = None
+        for start in range(0, len(rows), batch_size):
+            batch = order[start : start + batch_size]
+            width = len(rows[batch[0]])
+            input_ids = np.full((len(batch), width), pad_id, dtype=np.int64)
+            attention_mask = np.zeros((len(batch), width), dtype=np.int64)
+            for i, j in enumerate(batch):
+                input_ids[i, : len(rows[j])] = rows[j]
+                attention_mask[i, : len(rows[j])] = 1
+            features = {
+                "input_ids": torch.from_numpy(input_ids).to(self.model.device),
+                "attention_mask": torch.from_numpy(attention_mask).to(
+                    self.model.device
+                ),
+            }
+            with torch.inference_mode():
+                emb = self.model(features)["sentence_embedding"]
+                emb = torch.nn.functional.normalize(emb.float(), p=2, dim=1)
+            if out is None:
+                out = np.empty((len(rows), emb.shape[1]), dtype=np.float32)
+            out[batch] = emb.cpu().numpy()
+        return out
@@ -5,32 +5,52 @@ from __future__ import annotations
 
 import json
 import os
+import sys
 import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import List
 
 from retrieval_system import utils
 
+try:
+    import orjson
+
+    _HAS_ORJSON = True
+except ImportError:
+    _HAS_ORJSON = False
+
 
 class ResultSaver:
-    """Manages the creation of output directories and saving of JSON results."""
+    """
+    Manages the creation of output directories and saving of JSON results.
+
+    Files are serialized and written by a pool of `max_workers` threads so
+    retrieval does not wait on disk I/O (orjson and file writes release the
+    GIL); call `close()` before exiting to flush pending writes.
+    """
 
-    def __init__(self, output_root: str):
+    def __init__(self, output_root: str, max_workers: int = 8):
         self.output_root = output_root
         self.timestamp_folder = utils.timestamp_folder_kst()
         self.output_dir = os.path.join(self.output_root, self.timestamp_folder)
         utils.ensure_dir(self.output_dir)
+        self._pool = ThreadPoolExecutor(max_workers=max_workers)
+        self._futures: List[Future] = []
 
     def save_result(self, payload: dict[str, any]) -> str:
         """
-        Saves a single retrieval result payload to a JSON file.
+        Queues a single retrieval result payload to be saved as a JSON file.
 
         The filename is constructed from the question ID, model name, and a unique trial ID.
+        The payload must not be modified after this call.
 
         Args:
             payload (dict): The dictionary containing the result data.
                            Must include 'id', and 'model_name'.
 
         Returns:
-            str: The full path to the saved file.
+            str: The full path the file will be written to. Success or failure
+                of the write is logged once it completes.
         """
         qid = payload.get("id")
         model_name = payload.get("model_name")
@@ -47,11 +67,48 @@ class ResultSaver:
         filename = f"{qid}_{safe_model_name}_{trial_id}.json"
         filepath = os.path.join(self.output_dir, filename)
 
-        with open(filepath, "w", encoding="utf-8") as f:
-            json.dump(payload, f, ensure_ascii=False, indent=2)
-
+        future = self._pool.submit(self._write, filepath, payload)
+        # Report once the file is on disk (or failed), not when it is queued
+        future.add_done_callback(lambda f: self._log_write(f, qid, filepath))
+        self._futures.append(future)
         return filepath
 
+    @staticmethod
+    def _log_write(future: Future, qid: str, filepath: str) -> None:
+        """Logs the outcome of one background write."""
+        error = future.exception()
+        if error is None:
+            print(f"[OK] Saved result for QID {qid} to {filepath}", file=sys.stderr)
+        else:
+            print(
+                f"[ERROR] Failed to save result for QID {qid} to {filepath}: {error}",
+                file=sys.stderr,
+            )
+
+    def close(self) -> None:
+        """Waits until all queued results are written; re-raises any write error."""
+        self._pool.shutdown(wait=True)
+        errors = [f.exception() for f in self._futures if f.exception() is not None]
+        self._futures.clear()
+        if errors:
+            raise RuntimeError(f"Result writer failed: {errors[0]}")
+
+    @staticmethod
+    def _write(filepath: str, payload: dict[str, any]) -> None:
+        """Serializes one payload to `filepath`."""
+        if _HAS_ORJSON:
+            data = orjson.dumps(
+                payload,
+                option=orjson.OPT_INDENT_2
+                | orjson.OPT_NON_STR_KEYS
+                | orjson.OPT_SERIALIZE_NUMPY,
+            )
+            with open(filepath, "wb") as f:
+                f.write(data)
+        else:
+            with open(filepath, "w", encoding="utf-8") as f:
+                json.dump(payload, f, ensure_ascii=False, indent=2)
+
     def get_output_folder(self) -> str:
         """Returns the full path to the output directory for this run."""
         return self.output_dir
@@ -4,7 +4,7 @@
 from __future__ import annotations
 
 import sys
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Optional
 
 if TYPE_CHECKING:
     import numpy as np
@@ -19,16 +19,42 @@ except ImportError:
     pass
 
 
-def get_retriever(embeddings: np.ndarray, force_numpy: bool = False) -> Retriever:
+def get_retriever(
+    embeddings: np.ndarray,
+    force_numpy: bool = False,
+    index_spec: Optional[str] = None,
+    nprobe: int = 16,
+    source_path: Optional[str] = None,
+    fp16: bool = False,
+    use_gpu: bool = True,
+    quantize: Optional[str] = None,
+) -> Retriever:
     """
     Factory function to get the best available retriever.
     Prefers FaissRetriever if available, otherwise falls back to NumpyRetriever.
+    `index_spec`, `nprobe` and `source_path` (enables on-disk index caching)
+    are forwarded to FaissRetriever only; `fp16` applies to both backends.
+    `use_gpu` allows FAISS GPU offload; pass False when queries are encoded on
+    CPU so vectors are not shuttled to the device for every search.
+    `quantize` ("none", "fp16", "sq8", "pq") selects the FAISS vector codec.
     """
     if _HAS_FAISS and not force_numpy:
         from retrieval_system.retrievers.faiss_retriever import FaissRetriever
 
         print("[INFO] Using FAISS for retrieval.", file=sys.stderr)
-        return FaissRetriever(embeddings)
+        retriever = FaissRetriever(
+            embeddings,
+            index_spec=index_spec,
+            nprobe=nprobe,
+            source_path=source_path,
+            fp16=fp16,
+            use_gpu=use_gpu,
+            quantize=quantize,
+        )
+        # Smoke-test the index once so a broken FAISS path fails here, not mid-run.
+        if retriever.num_docs > 0:
+            retriever.search(embeddings[:1], top_k=1)
+        return retriever
 
     from retrieval_system.retrievers.numpy_retriever import NumpyRetriever
 
@@ -36,4 +62,4 @@ def get_retriever(embeddings: np.ndarray, force_numpy: bool = False) -> Retrieve
         "[INFO] FAISS not found or disabled. Using NumPy for retrieval (slower).",
         file=sys.stderr,
     )
-    return NumpyRetriever(embeddings)
+    return NumpyRetriever(embeddings, fp16=fp16)
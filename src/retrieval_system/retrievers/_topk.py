@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+"""Numba top-k selection kernels specialized for small, fixed k."""
+
+from __future__ import annotations
+
+from typing import Callable, Dict, Tuple
+
+import numba
+import numpy as np
+
+
+def _make_topk(k: int) -> Callable[[np.ndarray], Tuple[np.ndarray, np.ndarray]]:
+    """
+    Builds a top-k kernel with `k` frozen as a compile-time constant, so the
+    insertion loop over the running maxima has a fixed trip count LLVM can
+    unroll and keep in registers.
+
+    The kernel is serial: NumpyRetriever already runs one tile per worker
+    thread, and concurrent launches of parallel Numba kernels abort the
+    process under the default `workqueue` threading layer.
+    """
+
+    @numba.njit(fastmath=True, cache=True)
+    def topk(sims: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        num_rows, num_cols = sims.shape
+        out_scores = np.full((num_rows, k), -np.inf, dtype=np.float32)
+        out_indices = np.full((num_rows, k), -1, dtype=np.int64)
+        for r in range(num_rows):
+            best = np.full(k, -np.inf, dtype=np.float32)
+            best_idx = np.full(k, -1, dtype=np.int64)
+            for c in range(num_cols):
+                v = sims[r, c]
+                if v > best[k - 1]:
+                    # Compare-swap the new value down from the tail
+                    cur_v = v
+                    cur_i = np.int64(c)
+                    for j in range(k):
+                        if cur_v > best[j]:
+                            best[j], cur_v = cur_v, best[j]
+                            best_idx[j], cur_i = cur_i, best_idx[j]
+            out_scores[r] = best
+            out_indices[r] = best_idx
+        return out_scores, out_indices
+
+    return topk
+
+
+topk5 = _make_topk(5)
+topk10 = _make_topk(10)
+
+# k -> kernel; covers the CLI defaults (--top_k 10, singlehop --topk 5).
+TOPK_KERNELS: Dict[int, Callable[[np.ndarray], Tuple[np.ndarray, np.ndarray]]] = {
+    5: topk5,
+    10: topk10,
+}
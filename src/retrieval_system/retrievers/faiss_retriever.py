@@ -2,9 +2,14 @@
 """Retriever implementation using FAISS."""
 from __future__ import annotations
 
-from typing import Tuple
+import hashlib
+import math
+import os
+import sys
+from typing import Optional, Tuple
 
 import numpy as np
+from retrieval_system.utils import DEFAULT_CACHE_DIR
 from .base import Retriever
 
 try:
@@ -13,16 +18,237 @@ try:
 except ImportError:
     _HAS_FAISS = False
 
+# Below this corpus size an exact flat scan is fast enough and needs no training.
+MIN_DOCS_FOR_ANN = 50_000
+# With index_spec="auto", corpora above this size use HNSW instead of IVF.
+MIN_DOCS_FOR_HNSW = 200_000
+# HNSW graph parameters: neighbors per node, build-time and query-time beam width.
+HNSW_M = 32
+HNSW_EF_CONSTRUCTION = 40
+HNSW_EF_SEARCH = 64
+# Below this corpus size host<->device transfers outweigh the GPU speedup.
+MIN_DOCS_FOR_GPU = 10_000
+# Sub-quantizer counts (bytes per code) supported by GPU IVFPQ.
+GPU_IVFPQ_SUBQUANTIZERS = frozenset(
+    (1, 2, 3, 4, 8, 12, 16, 20, 24, 28, 32, 40, 48, 56, 64, 96)
+)
+# PQ needs ~39 training points per centroid (256 centroids per sub-quantizer).
+MIN_DOCS_FOR_PQ = 39 * 256
+
+
+def _num_gpus() -> int:
+    """Number of GPUs visible to FAISS; 0 for CPU-only builds."""
+    get_num_gpus = getattr(faiss, "get_num_gpus", None)
+    return get_num_gpus() if get_num_gpus else 0
+
+
+def _gpu_supported(index) -> bool:
+    """
+    True for index types GPU FAISS can clone: Flat, IVFFlat, IVFScalarQuantizer
+    and IVFPQ with a sub-quantizer count the GPU kernels implement. HNSW, PQ
+    and plain ScalarQuantizer indexes have no GPU counterpart.
+    """
+    index = faiss.downcast_index(index)
+    if isinstance(index, faiss.IndexIVFPQ):
+        return index.pq.nbits == 8 and index.pq.M in GPU_IVFPQ_SUBQUANTIZERS
+    return isinstance(
+        index, (faiss.IndexFlat, faiss.IndexIVFFlat, faiss.IndexIVFScalarQuantizer)
+    )
+
 
 class FaissRetriever(Retriever):
     """A fast retriever using FAISS for dense search."""
-    def __init__(self, embeddings: np.ndarray):
+    def __init__(
+        self,
+        embeddings: np.ndarray,
+        index_spec: Optional[str] = None,
+        nprobe: int = 16,
+        source_path: Optional[str] = None,
+        cache_dir: str = DEFAULT_CACHE_DIR,
+        fp16: bool = False,
+        use_gpu: bool = True,
+        quantize: Optional[str] = None,
+    ):
+        """
+        Args:
+            embeddings (np.ndarray): (N, D) L2-normalized document embeddings.
+            index_spec (str, optional): "flat", "ivf", "hnsw", "auto", or any
+                `faiss.index_factory` string such as "IVF4096,PQ32". "ivf" uses
+                sqrt(N) lists; "auto" picks flat below MIN_DOCS_FOR_ANN, IVF up to
+                MIN_DOCS_FOR_HNSW and HNSW above. Corpora smaller than
+                MIN_DOCS_FOR_ANN always use an exact flat index.
+            nprobe (int): Number of inverted lists probed at query time (IVF only).
+            source_path (str, optional): The VectorDB file the embeddings were
+                loaded from. When given, the built index is cached under
+                `cache_dir` and memory-mapped on later runs.
+            cache_dir (str): Directory for cached `.faiss` index files.
+            fp16 (bool): Store vectors of the exact (flat) index as FP16 via
+                IndexScalarQuantizer, halving memory traffic per search.
+            use_gpu (bool): Move the index to GPU 0 when FAISS sees a GPU and
+                the corpus has more than MIN_DOCS_FOR_GPU documents.
+            quantize (str, optional): Vector codec: "none", "fp16", "sq8" (int8
+                scalar quantizer, 4x smaller) or "pq" (product quantizer, D/4
+                bytes per vector). Applies to the flat index and to the "ivf" /
+                "hnsw" / "auto" aliases (e.g. "IVF{n},SQ8"); ignored with a
+                warning for explicit factory strings, which carry their own
+                codec. Queries stay float32. Defaults to "fp16" if `fp16` is
+                set, else "none".
+        """
         if not _HAS_FAISS:
             raise ImportError("FAISS is not installed. Please install it with 'pip install faiss-cpu' or 'pip install faiss-gpu'.")
         super().__init__(embeddings)
-        # For L2-normalized vectors, inner product is equivalent to cosine similarity.
-        self.index = faiss.IndexFlatIP(self.dim)
-        self.index.add(self.embeddings.astype(np.float32))
+        self.quantize = (quantize or ("fp16" if fp16 else "none")).lower()
+        if self.quantize not in ("none", "fp16", "sq8", "pq"):
+            raise ValueError(f"Unknown quantize option: {quantize}")
+        if self.quantize == "pq" and self.num_docs < MIN_DOCS_FOR_PQ:
+            print(
+                f"[WARN] {self.num_docs} docs are too few to train PQ; using sq8.",
+                file=sys.stderr,
+            )
+            self.quantize = "sq8"
+        index_spec = self._resolve_index_spec(index_spec)
+        cache_path = (
+            self._cache_path(source_path, index_spec, cache_dir) if source_path else None
+        )
+        if cache_path and os.path.exists(cache_path):
+            print(f"[INFO] Loading cached FAISS index: {cache_path}", file=sys.stderr)
+            self.index = faiss.read_index(
+                cache_path, faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY
+            )
+        else:
+            self.index = self._build_index(index_spec)
+            if cache_path:
+                os.makedirs(cache_dir, exist_ok=True)
+                faiss.write_index(self.index, cache_path)
+        self._set_search_params(nprobe)
+        self._gpu_res = None
+        if use_gpu and self.num_docs > MIN_DOCS_FOR_GPU and _num_gpus() > 0:
+            self._move_to_gpu()
+
+    def _move_to_gpu(self) -> None:
+        """Clones the index to GPU 0 if GPU FAISS supports it; else stays on CPU."""
+        if not _gpu_supported(self.index):
+            print(
+                f"[INFO] {type(faiss.downcast_index(self.index)).__name__} has no "
+                "GPU implementation; keeping the FAISS index on CPU.",
+                file=sys.stderr,
+            )
+            return
+        try:
+            # Keep the resources alive for as long as the GPU index is in use.
+            res = faiss.StandardGpuResources()
+            self.index = faiss.index_cpu_to_gpu(res, 0, self.index)
+        except RuntimeError as e:
+            print(
+                f"[WARN] Could not move the FAISS index to GPU, using CPU: {e}",
+                file=sys.stderr,
+            )
+            return
+        self._gpu_res = res
+        print("[INFO] FAISS index moved to GPU 0.", file=sys.stderr)
+
+    def _resolve_index_spec(self, index_spec: Optional[str]) -> str:
+        """
+        Maps the flat/ivf/hnsw/auto aliases to a `faiss.index_factory` string
+        whose storage component is the `quantize` codec.
+        """
+        alias = (index_spec or "flat").lower()
+        if alias == "auto":
+            if self.num_docs < MIN_DOCS_FOR_ANN:
+                alias = "flat"
+            elif self.num_docs <= MIN_DOCS_FOR_HNSW:
+                alias = "ivf"
+            else:
+                alias = "hnsw"
+        if alias == "flat" or self.num_docs < MIN_DOCS_FOR_ANN:
+            # Small corpora always get the exact index; the codec goes in _flat_index
+            return "Flat" if alias in ("flat", "ivf", "hnsw") else index_spec
+        if alias == "ivf":
+            return f"IVF{max(1, int(math.sqrt(self.num_docs)))},{self._codec_spec()}"
+        if alias == "hnsw":
+            codec = self._codec_spec()
+            return f"HNSW{HNSW_M}" if codec == "Flat" else f"HNSW{HNSW_M},{codec}"
+        if self.quantize != "none":
+            print(
+                f"[WARN] quantize='{self.quantize}' is ignored for the explicit "
+                f"index spec '{index_spec}'; put the codec in the spec instead.",
+                file=sys.stderr,
+            )
+            self.quantize = "none"
+        return index_spec
+
+    def _codec_spec(self) -> str:
+        """`faiss.index_factory` storage component for the selected codec."""
+        if self.quantize == "pq":
+            return f"PQ{self._pq_subquantizers()}"
+        return {"none": "Flat", "fp16": "SQfp16", "sq8": "SQ8"}[self.quantize]
+
+    def _pq_subquantizers(self) -> int:
+        """Largest sub-quantizer count <= D/4 that divides D (~4 dims per byte)."""
+        return next(
+            m for m in range(max(1, self.dim // 4), 0, -1) if self.dim % m == 0
+        )
+
+    def _cache_path(
+        self, source_path: str, index_spec: Optional[str], cache_dir: str
+    ) -> str:
+        """Returns the cache file path keyed on the source file and index shape."""
+        key = "|".join(
+            [
+                os.path.abspath(source_path),
+                str(os.path.getmtime(source_path)),
+                str(self.dim),
+                str(self.num_docs),
+                index_spec,
+                "fp32" if self.quantize == "none" else self.quantize,
+            ]
+        )
+        digest = hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+        return os.path.join(cache_dir, f"index_{digest}.faiss")
+
+    def _build_index(self, index_spec: str):
+        """Builds (and trains, if required) the FAISS index over the embeddings."""
+        xb = np.ascontiguousarray(self.embeddings, dtype=np.float32)
+        if index_spec == "Flat" or self.num_docs < MIN_DOCS_FOR_ANN:
+            # For L2-normalized vectors, inner product is equivalent to cosine similarity.
+            index = self._flat_index()
+            if not index.is_trained:
+                index.train(xb)
+        else:
+            index = faiss.index_factory(self.dim, index_spec, faiss.METRIC_INNER_PRODUCT)
+            hnsw = getattr(faiss.downcast_index(index), "hnsw", None)
+            if hnsw is not None:
+                hnsw.efConstruction = HNSW_EF_CONSTRUCTION
+            if not index.is_trained:
+                index.train(xb)
+        index.add(xb)
+        return index
+
+    def _flat_index(self):
+        """Creates the exact-scan index with the codec selected by `quantize`."""
+        if self.quantize == "none":
+            return faiss.IndexFlatIP(self.dim)
+        if self.quantize == "pq":
+            return faiss.IndexPQ(
+                self.dim, self._pq_subquantizers(), 8, faiss.METRIC_INNER_PRODUCT
+            )
+        qtype = {
+            "fp16": faiss.ScalarQuantizer.QT_fp16,
+            "sq8": faiss.ScalarQuantizer.QT_8bit,
+        }[self.quantize]
+        return faiss.IndexScalarQuantizer(
+            self.dim, qtype, faiss.METRIC_INNER_PRODUCT
+        )
+
+    def _set_search_params(self, nprobe: int) -> None:
+        """Sets query-time knobs: nprobe for IVF, efSearch for HNSW."""
+        try:
+            faiss.extract_index_ivf(self.index).nprobe = nprobe
+        except RuntimeError:
+            pass  # Not an IVF index (e.g. Flat, HNSW); nprobe does not apply.
+        hnsw = getattr(faiss.downcast_index(self.index), "hnsw", None)
+        if hnsw is not None:
+            hnsw.efSearch = HNSW_EF_SEARCH
 
     def search(
         self, query_vecs: np.ndarray, top_k: int
@@ -31,8 +257,6 @@ class FaissRetriever(Retriever):
         if query_vecs.ndim != 2 or query_vecs.shape[1] != self.dim:
             raise ValueError(f"Query vectors must have shape (Q, {self.dim})")
         
-        k = min(top_k, self.n_docs)
+        k = min(top_k, self.num_docs)
         scores, indices = self.index.search(query_vecs.astype(np.float32), k)
         return scores, indices
-
-
@@ -3,13 +3,52 @@
 
 from __future__ import annotations
 
-from typing import Tuple
+import functools
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Tuple
 
 import numpy as np
 
 # Use absolute import path
 from retrieval_system.retrievers.base import Retriever
 
+try:
+    from retrieval_system.retrievers._topk import TOPK_KERNELS
+except ImportError:
+    TOPK_KERNELS = {}
+
+# Number of documents scored per matmul tile; bounds the (Q, chunk) buffer.
+CHUNK_SIZE = 8192
+# Queries scored per matmul; keeps each (block, chunk) score buffer cache-sized.
+QUERY_BLOCK = 64
+
+
+@functools.lru_cache(maxsize=None)
+def _cpu_has_native_fp16() -> bool:
+    """True if the CPU advertises AVX512-FP16 (Linux only; False elsewhere)."""
+    try:
+        with open("/proc/cpuinfo", "r", encoding="utf-8") as f:
+            for line in f:
+                if line.startswith("flags"):
+                    return "avx512_fp16" in line.split()
+    except OSError:
+        pass
+    return False
+
+
+def _topk_unsorted(
+    scores: np.ndarray, indices: np.ndarray, k: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Keeps the k best columns per row of (scores, indices), in no particular order."""
+    if scores.shape[1] <= k:
+        return scores, indices
+    part = np.argpartition(-scores, kth=k - 1, axis=1)[:, :k]
+    return (
+        np.take_along_axis(scores, part, axis=1),
+        np.take_along_axis(indices, part, axis=1),
+    )
+
 
 class NumpyRetriever(Retriever):
     """
@@ -17,8 +56,47 @@ class NumpyRetriever(Retriever):
     This serves as a fallback when FAISS is not available.
     """
 
-    def __init__(self, embeddings: np.ndarray):
+    def __init__(
+        self,
+        embeddings: np.ndarray,
+        fp16: bool = False,
+        n_threads: Optional[int] = None,
+    ):
         super().__init__(embeddings)
+        self.n_threads = n_threads or os.cpu_count() or 1
+        # FP16 matmul is only worthwhile with native hardware support;
+        # otherwise NumPy emulates it and is far slower than FP32 BLAS.
+        self.fp16 = fp16 and _cpu_has_native_fp16()
+        if self.fp16:
+            self.embeddings = self.embeddings.astype(np.float16)
+        # (D, chunk) tiles are transposed views, not copies: BLAS reads the
+        # row-major rows as a transposed operand, so memory stays at one matrix
+        # and memory-mapped embeddings are only paged in as tiles are scored.
+        self._chunks = [
+            (start, self.embeddings[start : start + CHUNK_SIZE].T)
+            for start in range(0, self.num_docs, CHUNK_SIZE)
+        ]
+
+    def _search_chunk(
+        self, q: np.ndarray, start: int, chunk_t: np.ndarray, k: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Scores one (D, chunk) tile per query block; returns its unsorted top-k."""
+        kk = min(k, chunk_t.shape[1])
+        kernel = TOPK_KERNELS.get(k) if kk == k else None
+        block_scores, block_ids = [], []
+        for qb in range(0, q.shape[0], QUERY_BLOCK):
+            # Shape: (QUERY_BLOCK, D) @ (D, chunk) -> (QUERY_BLOCK, chunk)
+            sims = (q[qb : qb + QUERY_BLOCK] @ chunk_t).astype(np.float32, copy=False)
+            if kernel is not None:
+                scores, local_ids = kernel(sims)
+            else:
+                # Negate in place so argpartition needs no second (QB, chunk) buffer
+                np.negative(sims, out=sims)
+                local_ids = np.argpartition(sims, kth=kk - 1, axis=1)[:, :kk]
+                scores = -np.take_along_axis(sims, local_ids, axis=1)
+            block_scores.append(scores)
+            block_ids.append(local_ids + start)
+        return np.concatenate(block_scores), np.concatenate(block_ids)
 
     def search(
         self, query_vecs: np.ndarray, top_k: int
@@ -26,27 +104,38 @@ class NumpyRetriever(Retriever):
         """
         Performs a search using NumPy's dot product.
         For L2-normalized vectors, this is equivalent to cosine similarity.
+
+        Documents are scored tile by tile on a thread pool (BLAS releases the
+        GIL) and each tile's top-k is merged, so memory stays
+        O(Q * (k * n_tiles + CHUNK_SIZE * n_threads)) instead of O(Q * N).
         """
         if query_vecs.shape[1] != self.dim:
             raise ValueError(
                 f"Query vector dimension {query_vecs.shape[1]} does not match index dimension {self.dim}"
             )
 
-        # Compute cosine similarities with matrix multiplication
-        # Shape: (num_queries, D) @ (D, num_docs) -> (num_queries, num_docs)
-        sim_matrix = query_vecs @ self.embeddings.T
-
-        # Get the indices of the top_k similarities for each query
-        # Using argpartition for efficiency is better than a full sort
         k = min(top_k, self.num_docs)
-        top_k_indices = np.argpartition(-sim_matrix, kth=k - 1, axis=1)[:, :k]
+        q = query_vecs.astype(self.embeddings.dtype, copy=False)
+
+        def score(chunk: Tuple[int, np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+            return self._search_chunk(q, chunk[0], chunk[1], k)
+
+        n_workers = min(self.n_threads, len(self._chunks))
+        if n_workers > 1:
+            with ThreadPoolExecutor(max_workers=n_workers) as pool:
+                partials = list(pool.map(score, self._chunks))
+        else:
+            partials = [score(chunk) for chunk in self._chunks]
 
-        # Get the scores for the top_k indices
-        top_k_scores = np.take_along_axis(sim_matrix, top_k_indices, axis=1)
+        best_scores, best_indices = _topk_unsorted(
+            np.concatenate([p[0] for p in partials], axis=1),
+            np.concatenate([p[1] for p in partials], axis=1),
+            k,
+        )
 
         # Sort within the top_k results to get the correct ranking
-        sorted_order = np.argsort(-top_k_scores, axis=1)
-        final_indices = np.take_along_axis(top_k_indices, sorted_order, axis=1)
-        final_scores = np.take_along_axis(top_k_scores, sorted_order, axis=1)
+        sorted_order = np.argsort(-best_scores, axis=1)
+        final_indices = np.take_along_axis(best_indices, sorted_order, axis=1)
+        final_scores = np.take_along_axis(best_scores, sorted_order, axis=1)
 
         return final_scores, final_indices
@@ -8,6 +8,13 @@ import uuid
 from typing import Any, Dict
 from . import utils
 
+try:
+    import orjson
+
+    _HAS_ORJSON = True
+except ImportError:
+    _HAS_ORJSON = False
+
 
 class ResultSaver:
     """Saves retrieval results to a structured directory."""
@@ -44,8 +51,20 @@ class ResultSaver:
         fname = f"{qid}_{safe_model}_{trial_id}.json"
         path = os.path.join(self.session_folder, fname)
 
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(payload, f, ensure_ascii=False, indent=2)
+        if _HAS_ORJSON:
+            # NumPy scores are serialized natively; no per-hit float() cast needed
+            with open(path, "wb") as f:
+                f.write(
+                    orjson.dumps(
+                        payload,
+                        option=orjson.OPT_INDENT_2
+                        | orjson.OPT_NON_STR_KEYS
+                        | orjson.OPT_SERIALIZE_NUMPY,
+                    )
+                )
+        else:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(payload, f, ensure_ascii=False, indent=2)
 
         return path
 
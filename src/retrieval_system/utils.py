@@ -11,11 +11,49 @@ from typing import TYPE_CHECKING
 if TYPE_CHECKING:
     import numpy as np
 
+try:
+    import faiss
+
+    _HAS_FAISS = True
+except ImportError:
+    _HAS_FAISS = False
+
+
+# Root for on-disk caches (FAISS indexes, encoded queries).
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "scion_rag")
+
 
 def l2_normalize(x: np.ndarray, eps: float = 1e-12) -> np.ndarray:
-    """Row-wise L2 normalize a 2D numpy array."""
-    norms = np.sqrt((x * x).sum(axis=1, keepdims=True)) + eps
-    return x / norms
+    """
+    Row-wise L2 normalize a 2D numpy array, in place where possible.
+
+    A writeable C-contiguous float32 input is modified and returned as-is; any
+    other input (other dtype, read-only, strided) is first copied to float32.
+    """
+    x = np.ascontiguousarray(x, dtype=np.float32)
+    if not x.flags.writeable:
+        x = x.copy()
+    if _HAS_FAISS:
+        faiss.normalize_L2(x)
+        return x
+    # einsum fuses multiply+reduce without an (N, D) temporary; divide in place
+    norms = np.sqrt(np.einsum("ij,ij->i", x, x))[:, None] + eps
+    np.divide(x, norms, out=x)
+    return x
+
+
+def is_unit_norm(x: np.ndarray, sample: int = 1024, tol: float = 1e-4) -> bool:
+    """
+    Checks whether the rows of a 2D array already have unit L2 norm.
+
+    Only about `sample` evenly strided rows are inspected, so the check costs a
+    small fraction of a full normalization pass.
+    """
+    if x.ndim != 2 or x.shape[0] == 0:
+        return False
+    rows = x[:: max(1, x.shape[0] // sample)]
+    sq_norms = np.einsum("ij,ij->i", rows, rows, dtype=np.float64)
+    return bool(np.max(np.abs(sq_norms - 1.0)) < tol)
 
 
 def now_kst() -> dt.datetime:
@@ -1,5 +1,6 @@
 from __future__ import annotations
 import argparse
+import importlib
 import os
 import subprocess
 import sys
@@ -49,6 +50,18 @@ def _check_files():
         )
 
 
+def _run_stage(module: str, argv: list, use_subprocess: bool) -> None:
+    """단계 스크립트의 main(argv)를 같은 프로세스에서 호출 (인터프리터 재시작 없음)."""
+    if use_subprocess:
+        cmd = [sys.executable, f"{module}.py", *argv]
+        print("[run]", " ".join(cmd))
+        subprocess.run(cmd, check=True)
+        return
+    print("[run]", module, " ".join(argv))
+    stage = importlib.import_module(module)
+    stage.main(argv)
+
+
 def main():
     _check_files()
 
@@ -66,6 +79,17 @@ def main():
     ap.add_argument("--temperature", type=float, default=0.2)
     ap.add_argument("--seed", type=int, default=None)
     ap.add_argument("--qps", type=float, default=None)
+    ap.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Gemini 변환 시 동시에 보낼 최대 요청 수 (기본 1: 순차 처리)",
+    )
+    ap.add_argument(
+        "--subprocess",
+        action="store_true",
+        help="각 단계를 별도 Python 프로세스로 실행 (이전 동작)",
+    )
     args = ap.parse_args()
 
     os.makedirs(args.outdir, exist_ok=True)
@@ -74,8 +98,6 @@ def main():
 
     # 1) 질문만 추출
     cmd1 = [
-        sys.executable,
-        "extract_questions.py",
         "--input",
         args.source,
         "--output",
@@ -83,13 +105,10 @@ def main():
     ]
     if args.question_col:
         cmd1 += ["--question-col", args.question_col]
-    print("[run]", " ".join(cmd1))
-    subprocess.run(cmd1, check=True)
+    _run_stage("extract_questions", cmd1, args.subprocess)
 
     # 2) Gemini 변환
     cmd2 = [
-        sys.executable,
-        "multi_hop_to_single_hop.py",
         "--input",
         qjsonl,
         "--output",
@@ -107,9 +126,9 @@ def main():
         cmd2 += ["--seed", str(args.seed)]
     if args.qps is not None:
         cmd2 += ["--qps", str(args.qps)]
+    cmd2 += ["--workers", str(args.workers)]
 
-    print("[run]", " ".join(cmd2))
-    subprocess.run(cmd2, check=True)
+    _run_stage("multi_hop_to_single_hop", cmd2, args.subprocess)
 
     print(f"Done. Output → {outjsonl}")
 
@@ -0,0 +1,59 @@
+import json
+import os
+
+import numpy as np
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from retrieval_system import data_loader
+
+
+def _write_db(path, rows):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("cn,title,embedding\n")
+        for cn, title, emb in rows:
+            f.write(f'{cn},{title},"[{", ".join(map(str, emb))}]"\n')
+
+
+@pytest.fixture
+def vectordb_files(tmp_path):
+    csv_path = str(tmp_path / "db.csv")
+    schema_path = str(tmp_path / "schema.json")
+    with open(schema_path, "w", encoding="utf-8") as f:
+        json.dump({"cn": "str", "title": "str", "embedding": "list"}, f)
+    _write_db(csv_path, [("a", "t1", [1.0, 0.0]), ("b", "t2", [0.0, 2.0])])
+    return csv_path, schema_path
+
+
+def test_second_load_uses_the_cache(vectordb_files):
+    csv_path, schema_path = vectordb_files
+    first = data_loader.load_vectordb_from_csv(csv_path, schema_path)
+    assert os.path.exists(csv_path + data_loader.METADATA_CACHE_SUFFIX)
+    second = data_loader.load_vectordb_from_csv(csv_path, schema_path)
+    assert isinstance(second.embeddings, np.memmap)
+    np.testing.assert_array_equal(second.embeddings, first.embeddings)
+    assert list(second.doc_ids) == ["a", "b"]
+    np.testing.assert_allclose(np.linalg.norm(second.embeddings, axis=1), 1.0)
+
+
+def test_csv_restored_with_older_mtime_invalidates_cache(vectordb_files):
+    csv_path, schema_path = vectordb_files
+    data_loader.load_vectordb_from_csv(csv_path, schema_path)
+    old = os.stat(csv_path)
+    # Same size, different content, mtime moved back like `cp -p` would
+    _write_db(csv_path, [("c", "t3", [0.0, 1.0]), ("d", "t4", [3.0, 0.0])])
+    assert os.stat(csv_path).st_size == old.st_size
+    os.utime(csv_path, ns=(old.st_atime_ns, old.st_mtime_ns - 10**9))
+    reloaded = data_loader.load_vectordb_from_csv(csv_path, schema_path)
+    assert list(reloaded.doc_ids) == ["c", "d"]
+    np.testing.assert_allclose(reloaded.embeddings, [[0.0, 1.0], [1.0, 0.0]])
+
+
+def test_cache_without_source_stat_is_ignored(vectordb_files):
+    csv_path, schema_path = vectordb_files
+    data_loader.load_vectordb_from_csv(csv_path, schema_path)
+    meta_path = csv_path + data_loader.METADATA_CACHE_SUFFIX
+    table = data_loader.pq.read_table(meta_path).replace_schema_metadata(None)
+    data_loader.pq.write_table(table, meta_path)
+    assert data_loader._load_vectordb_cache(csv_path, "cn", ["title"]) is None
@@ -0,0 +1,141 @@
+import os
+
+import numpy as np
+import pytest
+
+faiss = pytest.importorskip("faiss")
+
+from retrieval_system.retrievers import faiss_retriever
+from retrieval_system.retrievers.faiss_retriever import FaissRetriever
+
+
+def _unit_rows(rng, n, d):
+    x = rng.standard_normal((n, d)).astype(np.float32)
+    return x / np.linalg.norm(x, axis=1, keepdims=True)
+
+
+@pytest.fixture
+def fake_gpu(monkeypatch):
+    """Pretends one GPU is visible and records which indexes get cloned."""
+    cloned = []
+
+    def index_cpu_to_gpu(res, device, index):
+        cloned.append(type(faiss.downcast_index(index)).__name__)
+        raise RuntimeError("simulated GPU clone failure")
+
+    monkeypatch.setattr(faiss_retriever, "_num_gpus", lambda: 1)
+    monkeypatch.setattr(faiss_retriever, "MIN_DOCS_FOR_GPU", 0)
+    monkeypatch.setattr(faiss, "StandardGpuResources", object, raising=False)
+    monkeypatch.setattr(faiss, "index_cpu_to_gpu", index_cpu_to_gpu, raising=False)
+    return cloned
+
+
+def test_gpu_clone_failure_stays_on_cpu(fake_gpu):
+    docs = _unit_rows(np.random.default_rng(0), 500, 16)
+    retriever = FaissRetriever(docs, index_spec="flat")
+    assert fake_gpu == ["IndexFlatIP"]
+    assert retriever._gpu_res is None
+    _, indices = retriever.search(docs[:3], top_k=1)
+    np.testing.assert_array_equal(indices[:, 0], [0, 1, 2])
+
+
+@pytest.mark.parametrize("quantize", ["fp16", "sq8", "pq"])
+def test_cpu_only_codecs_are_not_offloaded(fake_gpu, quantize):
+    docs = _unit_rows(np.random.default_rng(0), 10_000, 16)
+    FaissRetriever(docs, index_spec="flat", quantize=quantize)
+    assert fake_gpu == []
+
+
+def _brute_force(queries, docs, k):
+    sims = queries @ docs.T
+    idx = np.argsort(-sims, axis=1, kind="stable")[:, :k]
+    return np.take_along_axis(sims, idx, axis=1), idx
+
+
+def test_flat_matches_brute_force():
+    rng = np.random.default_rng(3)
+    docs = _unit_rows(rng, 2_000, 32)
+    queries = _unit_rows(rng, 20, 32)
+    scores, indices = FaissRetriever(docs, use_gpu=False).search(queries, top_k=10)
+    ref_scores, ref_indices = _brute_force(queries, docs, 10)
+    np.testing.assert_array_equal(indices, ref_indices)
+    np.testing.assert_allclose(scores, ref_scores, rtol=1e-5, atol=1e-5)
+
+
+@pytest.mark.parametrize("quantize", ["fp16", "sq8", "pq"])
+def test_quantized_flat_keeps_top1(quantize):
+    rng = np.random.default_rng(4)
+    docs = _unit_rows(rng, 10_000, 32)
+    retriever = FaissRetriever(docs, quantize=quantize, use_gpu=False)
+    _, indices = retriever.search(docs[:50], top_k=1)
+    assert (indices[:, 0] == np.arange(50)).mean() >= 0.9
+
+
+def _cache_files(cache_dir):
+    return sorted(f for f in os.listdir(cache_dir) if f.endswith(".faiss"))
+
+
+def test_index_cache_is_reused_and_keyed_on_codec(tmp_path, capsys):
+    rng = np.random.default_rng(5)
+    docs = _unit_rows(rng, 1_000, 16)
+    source = tmp_path / "db.csv"
+    source.write_text("x")
+    kwargs = dict(source_path=str(source), cache_dir=str(tmp_path), use_gpu=False)
+
+    built = FaissRetriever(docs, **kwargs)
+    assert len(_cache_files(tmp_path)) == 1
+    capsys.readouterr()
+    reloaded = FaissRetriever(docs, **kwargs)
+    assert "Loading cached FAISS index" in capsys.readouterr().err
+    np.testing.assert_array_equal(
+        reloaded.search(docs[:5], 3)[1], built.search(docs[:5], 3)[1]
+    )
+
+    FaissRetriever(docs, quantize="sq8", **kwargs)
+    assert len(_cache_files(tmp_path)) == 2
+
+
+def test_index_cache_is_invalidated_by_a_newer_source(tmp_path):
+    docs = _unit_rows(np.random.default_rng(6), 500, 16)
+    source = tmp_path / "db.csv"
+    source.write_text("x")
+    kwargs = dict(source_path=str(source), cache_dir=str(tmp_path), use_gpu=False)
+    FaissRetriever(docs, **kwargs)
+    st = os.stat(source)
+    os.utime(source, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    FaissRetriever(docs, **kwargs)
+    assert len(_cache_files(tmp_path)) == 2
+
+
+def test_explicit_spec_ignores_quantize_in_cache_key(tmp_path, monkeypatch):
+    monkeypatch.setattr(faiss_retriever, "MIN_DOCS_FOR_ANN", 100)
+    docs = _unit_rows(np.random.default_rng(7), 2_000, 16)
+    source = tmp_path / "db.csv"
+    source.write_text("x")
+    kwargs = dict(source_path=str(source), cache_dir=str(tmp_path), use_gpu=False)
+    for quantize in (None, "sq8", "pq"):
+        retriever = FaissRetriever(
+            docs, index_spec="IVF16,Flat", quantize=quantize, **kwargs
+        )
+        assert retriever.quantize == "none"
+    assert len(_cache_files(tmp_path)) == 1
+
+
+@pytest.mark.parametrize(
+    "alias, quantize, expected",
+    [
+        ("ivf", "sq8", "IndexIVFScalarQuantizer"),
+        ("ivf", "pq", "IndexIVFPQ"),
+        ("ivf", None, "IndexIVFFlat"),
+        ("hnsw", "fp16", "IndexHNSWSQ"),
+    ],
+)
+def test_aliases_carry_the_codec(monkeypatch, alias, quantize, expected):
+    monkeypatch.setattr(faiss_retriever, "MIN_DOCS_FOR_ANN", 100)
+    docs = _unit_rows(np.random.default_rng(8), 10_000, 16)
+    retriever = FaissRetriever(
+        docs, index_spec=alias, quantize=quantize, use_gpu=False, nprobe=64
+    )
+    assert type(faiss.downcast_index(retriever.index)).__name__ == expected
+    _, indices = retriever.search(docs[:20], top_k=1)
+    assert (indices[:, 0] == np.arange(20)).mean() >= 0.9
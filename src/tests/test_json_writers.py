@@ -0,0 +1,117 @@
+import json
+from dataclasses import dataclass, field
+from typing import List
+
+import pytest
+
+from utils import save_as_json_2, save_as_jsonl, write_jsonl
+
+
+@dataclass
+class Doc:
+    cn: str
+    score: float
+    tags: List[str] = field(default_factory=list)
+
+
+def _docs(start, n):
+    return [
+        Doc(f"문서{i}", i / 4, [f"t{i}"] if i % 2 else [])
+        for i in range(start, start + n)
+    ]
+
+
+def _as_dicts(docs):
+    return [{"cn": d.cn, "score": d.score, "tags": d.tags} for d in docs]
+
+
+@pytest.fixture(params=[True, False], ids=["orjson", "json"])
+def has_orjson(request, monkeypatch):
+    if request.param:
+        pytest.importorskip("orjson")
+    for module in (save_as_json_2, save_as_jsonl, write_jsonl):
+        monkeypatch.setattr(module, "_HAS_ORJSON", request.param)
+    return request.param
+
+
+def test_json_append_matches_full_rewrite(tmp_path, has_orjson):
+    path = str(tmp_path / "out.json")
+    save_as_json_2.save_documents_to_json_batch(_docs(0, 3), path, Doc)
+    save_as_json_2.save_documents_to_json_batch(_docs(3, 2), path, Doc, mode="a")
+    save_as_json_2.save_documents_to_json_batch(_docs(5, 1), path, Doc, mode="a")
+    with open(path, encoding="utf-8") as f:
+        assert json.load(f) == _as_dicts(_docs(0, 6))
+
+
+@pytest.mark.parametrize(
+    "existing, expected_prefix",
+    [
+        ("[]", []),
+        ("[\n]\n\n", []),
+        (
+            '[\n    {"cn": "x", "nested": [1, [2]]}\n]',
+            [{"cn": "x", "nested": [1, [2]]}],
+        ),
+        ('[{"cn": "y"}]   \n', [{"cn": "y"}]),
+    ],
+    ids=["empty", "empty-multiline", "indent-4", "compact"],
+)
+def test_tail_append_on_existing_arrays(
+    tmp_path, has_orjson, existing, expected_prefix
+):
+    path = tmp_path / "out.json"
+    path.write_text(existing, encoding="utf-8")
+    assert save_as_json_2._append_to_json_array(str(path), _as_dicts(_docs(0, 2)))
+    assert json.loads(path.read_text(encoding="utf-8")) == expected_prefix + _as_dicts(
+        _docs(0, 2)
+    )
+
+
+@pytest.mark.parametrize("existing", ['{"a": 1}', "not json", "   \n"])
+def test_tail_append_declines_non_arrays(tmp_path, existing):
+    path = tmp_path / "out.json"
+    path.write_text(existing, encoding="utf-8")
+    assert not save_as_json_2._append_to_json_array(str(path), _as_dicts(_docs(0, 1)))
+    assert path.read_text(encoding="utf-8") == existing
+
+
+def test_append_to_object_file_still_raises(tmp_path, has_orjson):
+    path = tmp_path / "out.json"
+    path.write_text('{"a": 1}', encoding="utf-8")
+    with pytest.raises(IOError):
+        save_as_json_2.save_documents_to_json_batch(
+            _docs(0, 1), str(path), Doc, mode="a"
+        )
+
+
+def test_append_to_garbage_file_overwrites(tmp_path, has_orjson):
+    path = tmp_path / "out.json"
+    path.write_text("not json", encoding="utf-8")
+    save_as_json_2.save_documents_to_json_batch(_docs(0, 2), str(path), Doc, mode="a")
+    assert json.loads(path.read_text(encoding="utf-8")) == _as_dicts(_docs(0, 2))
+
+
+def test_jsonl_matches_json_dumps(tmp_path, has_orjson):
+    path = str(tmp_path / "out.jsonl")
+    save_as_jsonl.save_documents_to_jsonl_batch(_docs(0, 3), path, Doc)
+    save_as_jsonl.save_documents_to_jsonl_batch(_docs(3, 2), path, Doc, mode="a")
+    with open(path, encoding="utf-8") as f:
+        lines = f.read().splitlines()
+    assert [json.loads(line) for line in lines] == _as_dicts(_docs(0, 5))
+    # 두 경로 모두 compact 구분자와 원문 유니코드를 사용
+    expected = [
+        json.dumps(row, ensure_ascii=False, separators=(",", ":"))
+        for row in _as_dicts(_docs(0, 5))
+    ]
+    assert lines == expected
+
+
+def test_write_jsonl_matches_json_dumps(tmp_path, has_orjson):
+    path = str(tmp_path / "rows.jsonl")
+    rows = [{"q": "질문", "ids": [1, 2], "score": 0.5}, {"q": "", "ids": []}]
+    write_jsonl.write_jsonl(path, rows)
+    with open(path, encoding="utf-8") as f:
+        assert f.read() == "".join(
+            json.dumps(row, ensure_ascii=False, separators=(",", ":")) + "\n"
+            for row in rows
+        )
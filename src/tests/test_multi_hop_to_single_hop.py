@@ -0,0 +1,90 @@
+import argparse
+import json
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("google.generativeai")
+
+import multi_hop_to_single_hop as mh
+
+
+def _fake_process(rec, mode, model_obj, question_field, context_field):
+    # 뒤쪽 레코드가 먼저 끝나도록 지연을 거꾸로 줌
+    time.sleep(0.01 * (5 - rec["id"]))
+    if rec["id"] == 2:
+        raise ValueError("bad record")
+    return {
+        "id": rec["id"],
+        "mode": mode,
+        "single_hop_questions": [rec[question_field]],
+    }
+
+
+def _run(tmp_path, monkeypatch, workers, qps=None):
+    src = tmp_path / "in.jsonl"
+    src.write_text(
+        "".join(json.dumps({"id": i, "question": f"q{i}"}) + "\n" for i in range(5)),
+        encoding="utf-8",
+    )
+    monkeypatch.setattr(mh, "process_single_record", _fake_process)
+    args = argparse.Namespace(
+        input=str(src),
+        output=str(tmp_path / "out.jsonl"),
+        mode="decompose",
+        question_field="question",
+        context_field="context",
+        model="m",
+        temperature=0.0,
+        qps=qps,
+        workers=workers,
+    )
+    mh.run_batch_processing(args, model_obj=None)
+    with open(args.output, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_batch_results_keep_input_order(tmp_path, monkeypatch, workers):
+    rows = _run(tmp_path, monkeypatch, workers)
+    assert [row["id"] for row in rows] == [0, 1, 2, 3, 4]
+    assert rows[2]["error"] == "bad record"
+    assert rows[2]["original_record"] == {"id": 2, "question": "q2"}
+    assert rows[0]["meta"] == {"model": "m", "temperature": 0.0}
+
+
+def test_workers_match_sequential_output(tmp_path, monkeypatch):
+    assert _run(tmp_path, monkeypatch, 4) == _run(tmp_path, monkeypatch, 1)
+
+
+def test_rate_limiter_spaces_requests_across_threads():
+    limiter = mh._RateLimiter(qps=50)
+    stamps = []
+    lock = threading.Lock()
+
+    def worker():
+        for _ in range(3):
+            limiter.wait()
+            with lock:
+                stamps.append(time.monotonic())
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    stamps.sort()
+    gaps = [b - a for a, b in zip(stamps, stamps[1:])]
+    assert len(stamps) == 12
+    assert min(gaps) >= 0.02 * 0.8
+    assert stamps[-1] - stamps[0] >= 11 * 0.02 * 0.9
+
+
+@pytest.mark.parametrize("qps", [None, 0])
+def test_rate_limiter_disabled(qps):
+    limiter = mh._RateLimiter(qps)
+    start = time.monotonic()
+    for _ in range(100):
+        limiter.wait()
+    assert time.monotonic() - start < 0.05
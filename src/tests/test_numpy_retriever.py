@@ -0,0 +1,62 @@
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+pytest.importorskip("numba")
+
+from retrieval_system.retrievers.numpy_retriever import CHUNK_SIZE, NumpyRetriever
+
+SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _unit_rows(rng, n, d):
+    x = rng.standard_normal((n, d)).astype(np.float32)
+    return x / np.linalg.norm(x, axis=1, keepdims=True)
+
+
+def _brute_force(queries, docs, k):
+    sims = queries @ docs.T
+    idx = np.argsort(-sims, axis=1, kind="stable")[:, :k]
+    return np.take_along_axis(sims, idx, axis=1), idx
+
+
+@pytest.mark.parametrize("k", [5, 10, 7])
+def test_multi_worker_tiles_match_brute_force(k):
+    rng = np.random.default_rng(0)
+    docs = _unit_rows(rng, 5 * CHUNK_SIZE + 123, 32)
+    queries = _unit_rows(rng, 70, 32)
+    retriever = NumpyRetriever(docs, n_threads=8)
+    scores, indices = retriever.search(queries, top_k=k)
+    ref_scores, ref_indices = _brute_force(queries, docs, k)
+    np.testing.assert_array_equal(indices, ref_indices)
+    np.testing.assert_allclose(scores, ref_scores, rtol=1e-5, atol=1e-6)
+
+
+def test_top_k_larger_than_corpus():
+    rng = np.random.default_rng(1)
+    docs = _unit_rows(rng, 4, 8)
+    queries = _unit_rows(rng, 3, 8)
+    scores, indices = NumpyRetriever(docs).search(queries, top_k=10)
+    assert indices.shape == (3, 4)
+    np.testing.assert_array_equal(indices, _brute_force(queries, docs, 4)[1])
+
+
+@pytest.mark.parametrize("k", [5, 10])
+def test_multi_worker_kernels_under_workqueue_layer(k):
+    # Concurrent launches of parallel Numba kernels abort under workqueue
+    code = (
+        "import numpy as np\n"
+        "from retrieval_system.retrievers.numpy_retriever import NumpyRetriever\n"
+        "rng = np.random.default_rng(0)\n"
+        "docs = rng.standard_normal((200_000, 16)).astype(np.float32)\n"
+        "q = rng.standard_normal((8, 16)).astype(np.float32)\n"
+        f"NumpyRetriever(docs, n_threads=8).search(q, top_k={k})\n"
+    )
+    env = dict(os.environ, NUMBA_THREADING_LAYER="workqueue", PYTHONPATH=SRC_DIR)
+    proc = subprocess.run(
+        [sys.executable, "-c", code], env=env, capture_output=True, text=True
+    )
+    assert proc.returncode == 0, proc.stderr
@@ -0,0 +1,119 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from retrieval_system import query_cache
+from retrieval_system.query_cache import QueryEmbeddingCache
+from retrieval_system.query_encoder import QueryEncoder
+
+
+def test_put_many_get_many_roundtrip(tmp_path):
+    path = str(tmp_path / "cache" / "q.sqlite")
+    cache = QueryEmbeddingCache(path)
+    rng = np.random.default_rng(0)
+    items = {f"k{i}": rng.standard_normal(8).astype(np.float32) for i in range(5)}
+    cache.put_many(items.items())
+    found = cache.get_many(["k0", "k3", "missing"])
+    assert set(found) == {"k0", "k3"}
+    np.testing.assert_array_equal(found["k3"], items["k3"])
+    cache.close()
+
+    reopened = QueryEmbeddingCache(path)
+    assert len(reopened.get_many(items)) == 5
+    reopened.close()
+
+
+def test_get_many_batches_past_the_sqlite_parameter_limit(tmp_path):
+    cache = QueryEmbeddingCache(str(tmp_path / "q.sqlite"))
+    n = query_cache._MAX_PARAMS * 2 + 3
+    cache.put_many((f"k{i}", np.full(2, i, dtype=np.float32)) for i in range(n))
+    found = cache.get_many(f"k{i}" for i in range(n))
+    assert len(found) == n
+    assert found[f"k{n - 1}"][0] == n - 1
+    cache.close()
+
+
+def test_put_many_overwrites_and_casts_to_float32(tmp_path):
+    cache = QueryEmbeddingCache(str(tmp_path / "q.sqlite"))
+    cache.put_many([("k", np.ones(4, dtype=np.float64))])
+    cache.put_many([("k", np.arange(4, dtype=np.float64))])
+    vec = cache.get_many(["k"])["k"]
+    assert vec.dtype == np.float32
+    np.testing.assert_array_equal(vec, np.arange(4))
+    cache.close()
+
+
+def test_make_key_depends_on_every_part():
+    base = QueryEmbeddingCache.make_key("m", "inst: ", "q")
+    assert base == QueryEmbeddingCache.make_key("m", "inst: ", "q")
+    assert base != QueryEmbeddingCache.make_key("m2", "inst: ", "q")
+    assert base != QueryEmbeddingCache.make_key("m", "", "q")
+    assert base != QueryEmbeddingCache.make_key("m", "inst: ", "q2")
+    # 구분자 덕분에 경계가 달라지면 다른 키
+    assert QueryEmbeddingCache.make_key("ab", "c", "") != QueryEmbeddingCache.make_key(
+        "a", "bc", ""
+    )
+
+
+@pytest.fixture
+def fake_encoder(monkeypatch):
+    """Returns a factory for QueryEncoders whose forward pass is a counting fake."""
+    calls = []
+
+    def fake_encode(self, texts, instruction, batch_size):
+        calls.append(list(texts))
+        out = np.array(
+            [[len(t), len(instruction), 1.0] for t in texts], dtype=np.float32
+        )
+        return out / np.linalg.norm(out, axis=1, keepdims=True)
+
+    fake_model = SimpleNamespace(
+        device=SimpleNamespace(type="cpu"),
+        get_sentence_embedding_dimension=lambda: 3,
+    )
+    monkeypatch.setattr(QueryEncoder, "_load_model", lambda self: fake_model)
+    monkeypatch.setattr(QueryEncoder, "_encode", fake_encode)
+
+    def make(**kwargs):
+        return QueryEncoder("fake-model", **kwargs)
+
+    make.calls = calls
+    return make
+
+
+def test_encoder_encodes_each_text_once(fake_encoder):
+    encoder = fake_encoder()
+    first = encoder.encode_queries(["a", "bb", "a"], instruction="")
+    assert fake_encoder.calls == [["a", "bb"]]
+    np.testing.assert_array_equal(first[0], first[2])
+    second = encoder.encode_queries(["bb", "a"], instruction="")
+    assert fake_encoder.calls == [["a", "bb"]]
+    np.testing.assert_array_equal(second, first[[1, 0]])
+    # 다른 instruction은 다른 벡터이므로 다시 인코딩
+    encoder.encode_queries(["a"], instruction="x: ")
+    assert fake_encoder.calls[-1] == ["a"]
+
+
+def test_encoder_disk_cache_matches_fresh_encoding(fake_encoder, tmp_path):
+    path = str(tmp_path / "q.sqlite")
+    fresh = fake_encoder(cache=QueryEmbeddingCache(path)).encode_queries(["a", "bb"])
+    assert len(fake_encoder.calls) == 1
+
+    cached = fake_encoder(cache=QueryEmbeddingCache(path)).encode_queries(["bb", "a"])
+    assert len(fake_encoder.calls) == 1
+    np.testing.assert_array_equal(cached, fresh[[1, 0]])
+
+
+def test_encoder_memo_evicts_oldest(fake_encoder):
+    encoder = fake_encoder(memo_size=2)
+    encoder.encode_queries(["a", "bb", "ccc"], instruction="")
+    assert list(encoder._memo) == [
+        QueryEmbeddingCache.make_key("fake-model", "", q) for q in ("bb", "ccc")
+    ]
+    encoder.encode_queries(["a"], instruction="")
+    assert fake_encoder.calls[-1] == ["a"]
+
+
+def test_encoder_empty_queries(fake_encoder):
+    assert fake_encoder().encode_queries([]).shape == (0, 3)
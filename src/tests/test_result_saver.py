@@ -0,0 +1,28 @@
+import json
+import os
+
+import pytest
+
+from retrieval_system.result_saver import ResultSaver
+
+
+def test_ok_is_logged_only_after_the_file_exists(tmp_path, capsys):
+    saver = ResultSaver(str(tmp_path))
+    path = saver.save_result({"id": "q1", "model_name": "org/model", "hits": [1]})
+    saver.close()
+    err = capsys.readouterr().err
+    assert f"[OK] Saved result for QID q1 to {path}" in err
+    with open(path, encoding="utf-8") as f:
+        assert json.load(f)["hits"] == [1]
+
+
+def test_failed_write_is_logged_as_error_not_ok(tmp_path, capsys):
+    saver = ResultSaver(str(tmp_path))
+    # Remove the output folder so the background write fails
+    os.rmdir(saver.get_output_folder())
+    saver.save_result({"id": "q2", "model_name": "m"})
+    with pytest.raises(RuntimeError):
+        saver.close()
+    err = capsys.readouterr().err
+    assert "[ERROR] Failed to save result for QID q2" in err
+    assert "[OK]" not in err
@@ -0,0 +1,69 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from rerank import retrieve_singlehop_contexts as rsc
+
+
+@pytest.fixture
+def vdb_csv(tmp_path):
+    rng = np.random.default_rng(0)
+    emb = rng.standard_normal((4, 3)).astype(np.float32)
+    path = str(tmp_path / "vdb.csv")
+    pd.DataFrame(
+        {
+            "cn": [f"d{i}" for i in range(4)],
+            "title": ["a", "b", "c", "d"],
+            "embedding": [str(row.tolist()) for row in emb],
+        }
+    ).to_csv(path, index=False)
+    return path, emb
+
+
+def _write_sidecar(csv_path, emb, newer=True):
+    sidecar = csv_path + rsc.EMBEDDINGS_SIDECAR_SUFFIX
+    np.save(sidecar, emb)
+    st = os.stat(csv_path)
+    delta = 10**9 if newer else -(10**9)
+    os.utime(sidecar, ns=(st.st_atime_ns, st.st_mtime_ns + delta))
+    return sidecar
+
+
+def test_sidecar_matches_csv_parsing(vdb_csv):
+    path, emb = vdb_csv
+    df_parsed, parsed = rsc.load_vdb(path)
+    _write_sidecar(path, emb)
+    df_cached, cached = rsc.load_vdb(path)
+    assert isinstance(cached, np.memmap)
+    np.testing.assert_allclose(cached, parsed, rtol=1e-6)
+    pd.testing.assert_frame_equal(df_cached, df_parsed)
+    assert "embedding" not in df_cached.columns
+
+
+def test_stale_sidecar_is_ignored(vdb_csv, capsys):
+    path, emb = vdb_csv
+    _write_sidecar(path, np.zeros_like(emb), newer=False)
+    _, loaded = rsc.load_vdb(path)
+    assert not isinstance(loaded, np.memmap)
+    np.testing.assert_allclose(loaded, emb, rtol=1e-6)
+    assert "Stale embedding sidecar" in capsys.readouterr().out
+
+
+@pytest.mark.parametrize("rows", [3, 5])
+def test_sidecar_with_other_row_count_is_ignored(vdb_csv, rows):
+    path, emb = vdb_csv
+    _write_sidecar(path, np.zeros((rows, 3), dtype=np.float32))
+    _, loaded = rsc.load_vdb(path)
+    np.testing.assert_allclose(loaded, emb, rtol=1e-6)
+
+
+def test_sidecar_is_not_used_for_jsonl(tmp_path):
+    path = str(tmp_path / "vdb.jsonl")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write('{"cn": "d0", "embedding": [1.0, 2.0]}\n\n')
+    np.save(path + rsc.EMBEDDINGS_SIDECAR_SUFFIX, np.zeros((1, 2), np.float32))
+    df, loaded = rsc.load_vdb(path)
+    assert list(df.columns) == ["cn"]
+    np.testing.assert_array_equal(loaded, [[1.0, 2.0]])
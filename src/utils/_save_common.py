@@ -0,0 +1,41 @@
+# /utils/_save_common.py
+
+from dataclasses import asdict
+from typing import Any, Dict, List
+
+
+def assert_all_of_type(documents: List[Any], document_class: type) -> None:
+    """
+    저장할 객체가 모두 document_class 타입인지 확인합니다.
+
+    대부분의 입력은 정확히 같은 클래스이므로, MRO 탐색이 없는 `type() is` 비교로
+    먼저 확인하고 실패할 때만 하위 클래스를 허용하는 isinstance 검사를 수행합니다.
+
+    Raises:
+        TypeError: document_class 타입이 아닌 객체가 있을 경우.
+    """
+    if all(type(doc) is document_class for doc in documents):
+        return
+    for doc in documents:
+        if not isinstance(doc, document_class):
+            raise TypeError(
+                f"오류: 저장할 데이터는 모두 '{document_class.__name__}' 타입이어야 합니다."
+            )
+
+
+# asdict()가 깊은 복사 없이 그대로 써도 되는 값 타입
+_LEAF_TYPES = frozenset((str, int, float, bool, type(None)))
+
+
+def fast_row_dict(doc: Any) -> Dict[str, Any]:
+    """
+    dataclass 객체를 JSON 직렬화용 dict로 변환합니다.
+
+    모든 필드 값이 스칼라이면 복사 없이 `doc.__dict__`를 그대로 반환하고,
+    중첩 dataclass/컨테이너가 있거나 `__dict__`가 없으면(slots) asdict()를 사용합니다.
+    반환된 dict는 읽기 전용으로만 사용해야 합니다.
+    """
+    row = getattr(doc, "__dict__", None)
+    if row is not None and all(type(v) in _LEAF_TYPES for v in row.values()):
+        return row
+    return asdict(doc)
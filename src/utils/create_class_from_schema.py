@@ -1,4 +1,5 @@
 import csv
+import functools
 import json
 import os
 from dataclasses import make_dataclass, fields, is_dataclass
@@ -24,6 +25,9 @@ def create_class_from_schema(class_name: str, schema_path: str = "schema.json")
     """
     JSON 스키마 파일로부터 동적으로 데이터 클래스를 생성합니다.
 
+    같은 (클래스 이름, 스키마 경로, 수정 시각)에 대해서는 캐시된 클래스를 반환하므로
+    반복 호출 시 파일 읽기와 make_dataclass 비용이 들지 않습니다.
+
     Args:
         class_name (str): 생성할 클래스의 이름 (예: "Document").
         schema_path (str): 스키마 파일의 경로.
@@ -35,6 +39,18 @@ def create_class_from_schema(class_name: str, schema_path: str = "schema.json")
         FileNotFoundError: 스키마 파일이 존재하지 않을 경우.
         TypeError: 스키마에 지원하지 않는 타입이 정의된 경우.
     """
+    try:
+        mtime_ns = os.stat(schema_path).st_mtime_ns
+    except FileNotFoundError:
+        raise FileNotFoundError(
+            f"오류: 스키마 파일 '{schema_path}'을 찾을 수 없습니다."
+        )
+    return _build_class_from_schema(class_name, schema_path, mtime_ns)
+
+
+@functools.lru_cache(maxsize=64)
+def _build_class_from_schema(class_name: str, schema_path: str, mtime_ns: int) -> type:
+    """스키마 파일을 읽어 데이터 클래스를 만듭니다. mtime_ns는 캐시 키로만 사용됩니다."""
     try:
         with open(schema_path, "r", encoding="utf-8") as f:
             schema = json.load(f)
@@ -1,7 +1,13 @@
-import jsonlines
 from typing import List, Dict
 import json
 
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
 
 def load_jsonl_2(jsonl_path: str) -> List[Dict]:
     """
@@ -14,10 +20,15 @@ def load_jsonl_2(jsonl_path: str) -> List[Dict]:
         documents: 문서 원본 데이터 리스트
     """
     documents = []
-    with jsonlines.open(jsonl_path) as reader:
-        for doc in reader:
-            print(reader)
-            documents.append(doc)
+    # 바이트 단위로 한 줄씩 읽어 orjson으로 파싱 (UTF-8 디코딩 단계 생략)
+    with open(jsonl_path, "rb") as f:
+        for i, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                documents.append(_json_loads(line))
+            except ValueError as e:
+                raise ValueError(f"Invalid JSON at line {i}: {e}") from e
     return documents
 
 
@@ -25,15 +36,16 @@ def load_jsonl(path):
     docs = []
     with open(path, "r", encoding="utf-8") as f:
         for i, line in enumerate(f, start=1):
-            s = line.strip()
-            if not s:
+            # 공백 줄 검사는 새 문자열을 만들지 않는 isspace()로, 파서는 앞뒤 공백을 허용
+            if line.isspace():
                 continue
             try:
-                docs.append(json.loads(s))
+                docs.append(json.loads(line))
             except Exception as e:
-                # 👉 여기서 구체적으로 알려줌
+                # 👉 여기서 구체적으로 알려줌 (잘라낸 내용은 오류 시에만 생성)
                 raise ValueError(
-                    f"Invalid JSON at line {i}: {e}\nLine content (truncated): {s[:200]}"
+                    f"Invalid JSON at line {i}: {e}\n"
+                    f"Line content (truncated): {line.strip()[:200]}"
                 ) from e
     return docs
 
@@ -51,36 +63,31 @@ def make_text_for_embedding(
     Returns:
         documents_data: 임베딩용 텍스트가 포함된 문서 리스트
     """
-    documents_data = []
+    # embedding_mode는 루프 내에서 변하지 않으므로 포맷 함수를 한 번만 선택
+    formatters = {
+        "3*title+abstract": lambda t, a: f"{t} {t} {t} {a}",
+        "title+abstract": lambda t, a: f"{t} {a}",
+        "title": lambda t, a: t,
+        "abstract": lambda t, a: a,
+    }
+    fmt = formatters.get(embedding_mode)
+    if fmt is None:
+        raise ValueError(f"Unknown embedding_mode: {embedding_mode}")
 
+    documents_data = []
     for doc in documents:
-        cn = doc.get("CN", "")
         title = doc.get("title", "")
         abstract = doc.get("abstract", "")
-        source = doc.get("source", "")
-
         if not (title.strip() or abstract.strip()):
             continue
 
-        # embedding_mode에 따라 텍스트 생성
-        if embedding_mode == "3*title+abstract":
-            embedding_text = f"{title} {title} {title} {abstract}"
-        elif embedding_mode == "title+abstract":
-            embedding_text = f"{title} {abstract}"
-        elif embedding_mode == "title":
-            embedding_text = title
-        elif embedding_mode == "abstract":
-            embedding_text = abstract
-        else:
-            raise ValueError(f"Unknown embedding_mode: {embedding_mode}")
-
         documents_data.append(
             {
-                "cn": cn,
+                "cn": doc.get("CN", ""),
                 "title": title,
                 "abstract": abstract,
-                "source": source,
-                "embedding_text": embedding_text,
+                "source": doc.get("source", ""),
+                "embedding_text": fmt(title, abstract),
                 "embedding_mode": embedding_mode,
             }
         )
@@ -88,16 +95,19 @@ def make_text_for_embedding(
     return documents_data
 
 
-def load_jsonl_and_make_text_for_embedding(jsonl_path, embedding_mode="title+abstract"):
+def load_jsonl_and_make_text_for_embedding(
+    jsonl_path, embedding_mode="3*title+abstract"
+):
     """
     JSONL 파일에서 모든 문서를 로드하고 임베딩할 텍스트 생성
 
     Args:
         jsonl_path: JSONL 파일 경로
+        embedding_mode: 텍스트 생성 방식 (기본값 "3*title+abstract")
 
     Returns:
         documents_data: 문서 정보가 담긴 리스트
     """
     docs = load_jsonl(jsonl_path)
-    docs_with_emb = make_text_for_embedding(docs, embedding_mode="3*title+abstract")
+    docs_with_emb = make_text_for_embedding(docs, embedding_mode=embedding_mode)
     return docs_with_emb
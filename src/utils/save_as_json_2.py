@@ -2,9 +2,63 @@
 
 import json
 import os
-from dataclasses import asdict, is_dataclass
+from dataclasses import is_dataclass
 from typing import List, Any
 
+from ._save_common import assert_all_of_type, fast_row_dict
+
+try:
+    import orjson
+
+    _HAS_ORJSON = True
+except ImportError:
+    _HAS_ORJSON = False
+
+
+def _dumps_array(items: List[Any]) -> bytes:
+    """
+    리스트를 JSON 배열 bytes로 직렬화합니다 (항상 ']'와 줄바꿈으로 끝남).
+    json 대체 경로도 orjson과 같은 2칸 들여쓰기/구분자를 사용합니다. 단, 실수 표기
+    (예: 1e-05 vs 0.00001)와 NaN 처리(null vs NaN)는 두 경로가 다를 수 있습니다.
+    기존 4칸 들여쓰기는 orjson이 지원하지 않아 2칸으로 통일했습니다.
+    """
+    if _HAS_ORJSON:
+        return (
+            orjson.dumps(items, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY)
+            + b"\n"
+        )
+    return (json.dumps(items, ensure_ascii=False, indent=2) + "\n").encode("utf-8")
+
+
+def _append_to_json_array(output_file: str, items: List[Any]) -> bool:
+    """
+    JSON 배열 파일의 닫는 ']' 앞에 항목을 이어 붙입니다.
+
+    기존 내용은 읽거나 파싱하지 않고 파일 끝부분만 확인하므로, 이어쓰기 비용이
+    파일 크기와 무관합니다.
+
+    Returns:
+        bool: 이어 붙였으면 True, 파일이 JSON 배열로 끝나지 않으면 False.
+    """
+    with open(output_file, "r+b") as f:
+        end = f.seek(0, os.SEEK_END)
+        tail_start = max(0, end - 4096)
+        f.seek(tail_start)
+        tail = f.read().rstrip()
+        if not tail.endswith(b"]"):
+            return False
+        before = tail[:-1].rstrip()
+        if not before:
+            return False  # 끝부분이 공백뿐이라 배열 시작 여부를 알 수 없음
+        # "[" 바로 뒤의 "]"는 최상위 빈 배열
+        is_empty = before.endswith(b"[")
+        # 마지막 항목(또는 '[') 바로 뒤에서 자르고 ", 새 항목들]"을 씀
+        f.seek(tail_start + len(before))
+        f.truncate()
+        body = _dumps_array(items).rstrip()[1:-1]
+        f.write((b"" if is_empty else b",") + body + b"]\n")
+    return True
+
 
 def save_documents_to_json_batch(
     documents: List[Any], output_file: str, document_class: type, mode: str = "w"
@@ -27,23 +81,32 @@ def save_documents_to_json_batch(
     if mode not in ["w", "a"]:
         raise ValueError("오류: mode는 'w' 또는 'a'여야 합니다.")
 
-    for doc in documents:
-        if not isinstance(doc, document_class):
-            raise TypeError(
-                f"오류: 저장할 데이터는 모두 '{document_class.__name__}' 타입이어야 합니다."
-            )
+    assert_all_of_type(documents, document_class)
 
     # --- 데이터 준비 ---
-    # dataclass 객체를 dictionary 리스트로 변환
-    new_data = [asdict(doc) for doc in documents]
+    # dataclass 객체를 dictionary 리스트로 변환 (orjson은 dataclass를 직접 직렬화)
+    new_data = (
+        list(documents) if _HAS_ORJSON else [fast_row_dict(doc) for doc in documents]
+    )
 
     # --- 파일 처리 ---
     final_data = []
-    file_exists = os.path.exists(output_file)
+    try:
+        # 존재 여부와 크기를 stat 한 번으로 확인 (없으면 0)
+        existing_size = os.stat(output_file).st_size
+    except FileNotFoundError:
+        existing_size = 0
 
     try:
         # 'a' (이어쓰기) 모드이고 파일이 이미 존재할 경우
-        if mode == "a" and file_exists and os.path.getsize(output_file) > 0:
+        if mode == "a" and existing_size > 0:
+            # 배열로 끝나는 파일이면 기존 내용을 읽지 않고 닫는 ']' 앞에 바로 추가
+            if _append_to_json_array(output_file, new_data):
+                print(
+                    f"✅ 총 {len(documents)}개 항목을 '{output_file}'에 이어 붙였습니다."
+                )
+                return
+            # 배열로 끝나지 않는 파일은 전체를 읽어 검증 (아래에서 오류 또는 덮어쓰기)
             with open(output_file, "r", encoding="utf-8") as f:
                 try:
                     existing_data = json.load(f)
@@ -63,8 +126,8 @@ def save_documents_to_json_batch(
         final_data.extend(new_data)
 
         # 최종 데이터를 파일에 쓰기 (항상 'w' 모드로 덮어씀)
-        with open(output_file, "w", encoding="utf-8") as f:
-            json.dump(final_data, f, ensure_ascii=False, indent=4)
+        with open(output_file, "wb") as f:
+            f.write(_dumps_array(final_data))
 
     except (IOError, ValueError) as e:
         raise IOError(
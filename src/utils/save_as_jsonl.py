@@ -2,9 +2,18 @@
 
 import json
 import os
-from dataclasses import asdict, is_dataclass
+from dataclasses import is_dataclass
 from typing import List, Any
 
+from ._save_common import assert_all_of_type, fast_row_dict
+
+try:
+    import orjson
+
+    _HAS_ORJSON = True
+except ImportError:
+    _HAS_ORJSON = False
+
 
 def save_documents_to_jsonl_batch(
     documents: List[Any], output_file: str, document_class: type, mode: str = "w"
@@ -27,22 +36,31 @@ def save_documents_to_jsonl_batch(
     if mode not in ["w", "a"]:
         raise ValueError("오류: mode는 'w' 또는 'a'여야 합니다.")
 
-    for doc in documents:
-        if not isinstance(doc, document_class):
-            raise TypeError(
-                f"오류: 저장할 데이터는 모두 '{document_class.__name__}' 타입이어야 합니다."
-            )
+    assert_all_of_type(documents, document_class)
 
     # --- 파일 처리 ---
     try:
         # JSONL은 CSV처럼 mode ('w' or 'a')를 직접 사용할 수 있음
-        with open(output_file, mode, encoding="utf-8") as f:
-            for doc in documents:
-                # dataclass를 dict로 변환 후 json 문자열로 변환
-                doc_dict = asdict(doc)
-                json_string = json.dumps(doc_dict, ensure_ascii=False)
-                # 파일에 한 줄로 쓴다
-                f.write(json_string + "\n")
+        # 모든 줄을 미리 이어 붙여 1 MiB 버퍼 파일에 한 번에 쓴다 (write 호출 1회)
+        if _HAS_ORJSON:
+            # orjson은 dataclass를 asdict 없이 바로 UTF-8 bytes로 직렬화
+            lines = [
+                orjson.dumps(doc, option=orjson.OPT_SERIALIZE_NUMPY)
+                for doc in documents
+            ]
+            with open(output_file, mode + "b", buffering=1 << 20) as f:
+                f.write(b"\n".join(lines) + b"\n")
+        else:
+            # dataclass를 dict로 변환 후 json 문자열로 변환 (스칼라 필드는 복사 생략)
+            # orjson과 같은 compact 구분자 사용 (실수 표기/NaN 처리는 다를 수 있음)
+            lines = [
+                json.dumps(
+                    fast_row_dict(doc), ensure_ascii=False, separators=(",", ":")
+                )
+                for doc in documents
+            ]
+            with open(output_file, mode, encoding="utf-8", buffering=1 << 20) as f:
+                f.write("\n".join(lines) + "\n")
 
     except IOError as e:
         raise IOError(
@@ -1,8 +1,25 @@
 import json
 from typing import Dict, Any, List
 
+try:
+    import orjson
+
+    _HAS_ORJSON = True
+except ImportError:
+    _HAS_ORJSON = False
+
 
 def write_jsonl(path: str, rows: List[Dict[str, Any]]) -> None:
-    with open(path, "w", encoding="utf-8") as f:
-        for row in rows:
-            f.write(json.dumps(row, ensure_ascii=False) + "\n")
+    # 모든 줄을 미리 이어 붙여 1 MiB 버퍼 파일에 한 번에 쓴다 (write 호출 1회)
+    if _HAS_ORJSON:
+        payload = b"".join(orjson.dumps(row) + b"\n" for row in rows)
+        with open(path, "wb", buffering=1 << 20) as f:
+            f.write(payload)
+        return
+    # orjson과 같은 compact 구분자 사용 (실수 표기/NaN 처리는 다를 수 있음)
+    payload = "".join(
+        json.dumps(row, ensure_ascii=False, separators=(",", ":")) + "\n"
+        for row in rows
+    )
+    with open(path, "w", encoding="utf-8", buffering=1 << 20) as f:
+        f.write(payload)